@@ -1,9 +1,22 @@
+import os
+import threading
+import time
+
 import streamlit as st
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.datasets import fetch_california_housing
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
+import pandas as pd
+
+from homevalue import FEATURES, SLIDERS, metrics
+from homevalue.cache import PredictionCache
+from homevalue.drift import monitor_for
+from homevalue.formatting import fixed, location, usd
+from homevalue.geo import load_geo
+from homevalue.reload import RELOAD_INTERVAL, ModelWatcher
+from homevalue.sensitivity import sweep
+from homevalue.tiers import TIER_COLORS, TIER_NAMES, tier_codes
+from homevalue.train import load_or_train
+
+page_start = time.perf_counter()
 
 # ── Page config ────────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -342,6 +355,12 @@ section[data-testid="stSidebar"]{ display: none !important; }
     font-style: normal;
     color: #C8E0D2;
 }
+.res-range {
+    font-size: 0.8rem;
+    color: rgba(255,255,255,0.55);
+    margin: -0.3rem 0 0.9rem;
+    position: relative;
+}
 .res-tier {
     display: inline-block;
     font-size: 0.72rem;
@@ -469,17 +488,72 @@ section[data-testid="stSidebar"]{ display: none !important; }
 # ── Model ──────────────────────────────────────────────────────────────────────
 @st.cache_resource(show_spinner="Preparing the estimator… ⏳")
 def load_model():
-    housing = fetch_california_housing()
-    X, y = housing.data, housing.target
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42)
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train_scaled, y_train)
-    return model, scaler
+    # Loads the published artifact; only trains when none has been published.
+    with metrics.timed("load_model"):
+        return load_or_train()
+
+
+@st.cache_resource
+def model_watcher():
+    # Swaps in newly published versions without restarting the process.
+    interval = float(os.environ.get("HOMEVALUE_RELOAD_INTERVAL", RELOAD_INTERVAL))
+    return ModelWatcher(load_model(), interval=interval)
+
+
+@st.cache_resource
+def prediction_cache():
+    # One cache per process, shared by every session.
+    return PredictionCache()
+
+
+@st.cache_resource
+def drift_monitors():
+    # version -> DriftMonitor (None without a training profile), shared by all sessions.
+    return {}
+
+
+@st.cache_resource
+def drift_lock():
+    # Sessions rerun in their own threads; one at a time replaces the monitor.
+    return threading.Lock()
+
+
+def drift_monitor(bundle):
+    monitors = drift_monitors()
+    with drift_lock():
+        if bundle.version not in monitors:
+            for old in [v for v in monitors if v != bundle.version]:
+                if monitors[old] is not None:
+                    monitors[old].close()
+                del monitors[old]
+            monitors[bundle.version] = monitor_for(bundle)
+        return monitors[bundle.version]
 
-model, scaler = load_model()
+
+@st.cache_resource
+def metrics_server(port):
+    # Scrape target for the stage histograms; started once per process.
+    watcher, monitors = model_watcher(), drift_monitors()
+
+    def collect_drift():
+        monitor = monitors.get(watcher.bundle.version)
+        return monitor.collector()() if monitor is not None else ()
+
+    metrics.REGISTRY.register_collector(metrics.cache_collector(prediction_cache()))
+    metrics.REGISTRY.register_collector(collect_drift)
+    return metrics.serve(port)
+
+
+@st.cache_resource
+def geo_index(version, _bundle):
+    # Price surface + comparables for this model version, if they were built.
+    return load_geo(_bundle)
+
+
+model_watcher()
+cache = prediction_cache()
+if os.environ.get("HOMEVALUE_METRICS_PORT"):
+    metrics_server(int(os.environ["HOMEVALUE_METRICS_PORT"]))
 
 
 # ── Navbar ─────────────────────────────────────────────────────────────────────
@@ -517,159 +591,293 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# ── Step 1 — Neighborhood ─────────────────────────────────────────────────────
-st.markdown("""
-<div class="sec-header">
-    <div class="sec-dot">1</div>
-    <div class="sec-title">About the Neighborhood</div>
-</div>
-<div class="sec-desc">Describe the area where the property is located.</div>
-""", unsafe_allow_html=True)
+# ── What if ────────────────────────────────────────────────────────────────────
+SWEEP_LABELS = {
+    "MedInc": "💵 Median Household Income", "HouseAge": "🗓️ Age of the House",
+    "AveRooms": "🛋️ Average Rooms", "AveBedrms": "🛏️ Average Bedrooms",
+    "Population": "👥 Local Population", "AveOccup": "🏘️ People per Household",
+    "Latitude": "🧭 Latitude", "Longitude": "🧭 Longitude",
+}
+
+
+def curve_spec(feature):
+    # A plain Vega-Lite spec: st.line_chart rebuilds and schema-validates an Altair
+    # chart on every rerun, which cost more than the rest of the estimator together.
+    return {
+        "mark": {"type": "line", "color": "#5B7B6A", "tooltip": True},
+        "encoding": {
+            "x": {"field": "value", "type": "quantitative", "title": SWEEP_LABELS[feature],
+                  "scale": {"zero": False}},
+            "y": {"field": "price", "type": "quantitative", "title": "Estimated value ($)",
+                  "axis": {"format": "$,.0f"}},
+        },
+    }
+
 
-col1, col2 = st.columns(2, gap="large")
-
-with col1:
-    st.markdown('<div class="card"><div class="card-tag">Area & Demographics</div>', unsafe_allow_html=True)
-    MedInc = st.slider(
-        "💵  Median Household Income",
-        min_value=0.5, max_value=15.0, value=5.0, step=0.1,
-        help="Average income in the area (in $10,000s). For example, 5.0 means $50,000/year."
-    )
-    Population = st.slider(
-        "👥  Local Population",
-        min_value=3, max_value=35000, value=1000, step=50,
-        help="Total number of people living in this neighborhood block."
-    )
-    AveOccup = st.slider(
-        "🏘️  People per Household",
-        min_value=1.0, max_value=10.0, value=3.0, step=0.1,
-        help="Average number of people living in each nearby home."
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col2:
-    st.markdown('<div class="card"><div class="card-tag">Location in California</div>', unsafe_allow_html=True)
+@st.cache_data(max_entries=512, show_spinner=False)
+def price_curve(version, base, feature, _bundle):
+    # One batched prediction over the whole slider range of `feature`.
+    result = sweep(_bundle.predict, base, feature)
+    return pd.DataFrame({"value": result.values, "price": result.prices})
+
+
+# ── Estimate ───────────────────────────────────────────────────────────────────
+TIPS_HTML = """
+        <div class="tip">
+            <span class="tip-i">💵</span>
+            <span><strong>Income is key</strong> — wealthier neighborhoods almost always have higher property values.</span>
+        </div>
+        <div class="tip">
+            <span class="tip-i">🏡</span>
+            <span><strong>Age matters</strong> — newer homes tend to be worth more, while older ones may need renovation.</span>
+        </div>
+        <div class="tip">
+            <span class="tip-i">🌊</span>
+            <span><strong>Coast = premium</strong> — properties closer to the Pacific (more negative longitude) are typically pricier.</span>
+        </div>
+        <div class="tip">
+            <span class="tip-i">🛋️</span>
+            <span><strong>Room count</strong> — more rooms generally means a larger home and a higher price tag.</span>
+        </div>
+        """
+
+
+def drivers_html(contributions, top=4):
+    # The features that moved this estimate most, from the forest's tree paths.
+    tips = []
+    order = np.argsort(-np.abs(contributions))[:top]
+    for i, amount in zip(order, usd(np.abs(contributions[order]))):
+        icon, label = SWEEP_LABELS[FEATURES[i]].split(" ", 1)
+        effect = "raises" if contributions[i] >= 0 else "lowers"
+        tips.append(f"""
+        <div class="tip">
+            <span class="tip-i">{icon}</span>
+            <span><strong>{label}</strong> {effect} this estimate by {amount}.</span>
+        </div>""")
+    return "".join(tips)
+
+
+def estimate(bundle, comparables, drift, inputs):
+    # Everything the result section shows for one set of inputs, kept in
+    # session state so unchanged inputs redisplay it without recomputing.
+    MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude = inputs
+    with metrics.timed("features"):
+        features = np.array([inputs])
+    if drift is not None:
+        drift.observe(features)
+    with metrics.timed("predict"):
+        if bundle.forest is not None:
+            # Cached as (estimate, low, high): the 90% spread of the trees.
+            prediction, low, high = cache.get_or_compute(
+                bundle.version, features,
+                lambda: tuple(float(v[0]) for v in bundle.predict_interval(features)))
+        else:
+            prediction = cache.get_or_compute(
+                bundle.version, features, lambda: bundle.predict(features)[0])
+            low = high = None
+    price = prediction * 100_000
+
+    with metrics.timed("tier"):
+        code = int(tier_codes(price))
+        tier, tier_bg = TIER_NAMES[code], TIER_COLORS[code]
+
+    income_fmt = usd(MedInc * 10_000, suffix="/yr")
+    loc_fmt = location(Latitude, Longitude)
+    range_html = "" if low is None else (
+        '<div class="res-range">Likely range {} – {}</div>'.format(
+            *usd(np.array([low, high]) * 100_000)))
+    html = f"""
+        <div class="result-wrap">
+            <div class="res-eyebrow">Estimated Market Value</div>
+            <div class="res-price"><em>{usd(price)}</em></div>
+            {range_html}
+            <div class="res-tier" style="background:{tier_bg};">{tier}</div>
+            <div class="res-pills">
+                <div class="res-pill">🗓️ {HouseAge} yrs old</div>
+                <div class="res-pill">🛋️ {AveRooms:.1f} rooms</div>
+                <div class="res-pill">💵 {income_fmt} area</div>
+                <div class="res-pill">📍 {loc_fmt}</div>
+            </div>
+            <div class="res-note">
+                This is an AI estimate for informational purposes only.<br>
+                Actual values depend on market conditions, property specifics, and more.
+            </div>
+        </div>
+        """
+
+    table = None
+    if comparables is not None:
+        with metrics.timed("comparables"):
+            nearby = pd.DataFrame(comparables.nearest(Latitude, Longitude, k=5))
+            table = pd.DataFrame({
+                "Distance": fixed(nearby["distance_km"], 1, suffix=" km"),
+                "Block value": usd(nearby["Price"]),
+                "Income": usd(nearby["MedInc"] * 10_000, suffix="/yr"),
+                "Age": fixed(nearby["HouseAge"], 0, suffix=" yrs"),
+            })
+    tips = None
+    if bundle.forest is not None:
+        _, contributions = bundle.contributions(features)
+        tips = drivers_html(contributions[0] * 100_000)
+    return {"inputs": inputs, "version": bundle.version, "html": html, "comparables": table,
+            "tips": tips}
+
+
+# ── Estimator ──────────────────────────────────────────────────────────────────
+# Steps 1–3 and What If run as a fragment: moving a slider, estimating or
+# switching the What-If feature reruns only this function, so the CSS, navbar,
+# hero and How It Works markup are sent once per page load.
+@st.fragment
+def estimator():
+    start = time.perf_counter()
+    # Read once per run: a hot-swapped model takes effect on the next rerun.
+    bundle = model_watcher().bundle
+    _, comparables = geo_index(bundle.version, bundle)
+    drift = drift_monitor(bundle)
+
+
+    # ── Step 1 — Neighborhood ──────────────────────────────────────────────────
     st.markdown("""
-    <div class="tip">
-        <span class="tip-i">📍</span>
-        <span><strong>Quick reference:</strong> San Francisco ≈ 37.8°N, 122.4°W · Los Angeles ≈ 34.0°N, 118.2°W · San Diego ≈ 32.7°N, 117.2°W</span>
+    <div class="sec-header">
+        <div class="sec-dot">1</div>
+        <div class="sec-title">About the Neighborhood</div>
     </div>
+    <div class="sec-desc">Describe the area where the property is located.</div>
     """, unsafe_allow_html=True)
-    Latitude = st.slider(
-        "🧭  Latitude (North — South)",
-        min_value=32.0, max_value=42.0, value=34.0, step=0.1,
-        help="Higher values = further north. San Francisco is ~37.8, San Diego is ~32.7"
-    )
-    Longitude = st.slider(
-        "🧭  Longitude (East — West)",
-        min_value=-124.0, max_value=-114.0, value=-118.0, step=0.1,
-        help="More negative = closer to the Pacific coast. LA is about -118.2"
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-# ── Step 2 — Property ─────────────────────────────────────────────────────────
-st.markdown("""
-<div class="sec-header">
-    <div class="sec-dot">2</div>
-    <div class="sec-title">About the Property</div>
-</div>
-<div class="sec-desc">Details about the house — age, size, and rooms.</div>
-""", unsafe_allow_html=True)
 
-col3, col4 = st.columns(2, gap="large")
-
-with col3:
-    st.markdown('<div class="card"><div class="card-tag">Property Details</div>', unsafe_allow_html=True)
-    HouseAge = st.slider(
-        "🗓️  Age of the House (years)",
-        min_value=1, max_value=52, value=20,
-        help="How old the property is. Newer homes are generally valued higher."
-    )
-    AveRooms = st.slider(
-        "🛋️  Average Rooms per House",
-        min_value=1.0, max_value=15.0, value=5.0, step=0.1,
-        help="Typical number of rooms in homes in this area. A family home usually has 5–7."
-    )
-    AveBedrms = st.slider(
-        "🛏️  Average Bedrooms per House",
-        min_value=1.0, max_value=5.0, value=1.0, step=0.1,
-        help="Typical number of bedrooms in homes in this area."
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col4:
-    st.markdown('<div class="card"><div class="card-tag">Helpful Tips</div>', unsafe_allow_html=True)
+    col1, col2 = st.columns(2, gap="large")
+
+    with col1:
+        st.markdown('<div class="card"><div class="card-tag">Area & Demographics</div>', unsafe_allow_html=True)
+        MedInc = st.slider(
+            "💵  Median Household Income",
+            **SLIDERS["MedInc"], value=5.0,
+            help="Average income in the area (in $10,000s). For example, 5.0 means $50,000/year."
+        )
+        Population = st.slider(
+            "👥  Local Population",
+            **SLIDERS["Population"], value=1000,
+            help="Total number of people living in this neighborhood block."
+        )
+        AveOccup = st.slider(
+            "🏘️  People per Household",
+            **SLIDERS["AveOccup"], value=3.0,
+            help="Average number of people living in each nearby home."
+        )
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col2:
+        st.markdown('<div class="card"><div class="card-tag">Location in California</div>', unsafe_allow_html=True)
+        st.markdown("""
+        <div class="tip">
+            <span class="tip-i">📍</span>
+            <span><strong>Quick reference:</strong> San Francisco ≈ 37.8°N, 122.4°W · Los Angeles ≈ 34.0°N, 118.2°W · San Diego ≈ 32.7°N, 117.2°W</span>
+        </div>
+        """, unsafe_allow_html=True)
+        Latitude = st.slider(
+            "🧭  Latitude (North — South)",
+            **SLIDERS["Latitude"], value=34.0,
+            help="Higher values = further north. San Francisco is ~37.8, San Diego is ~32.7"
+        )
+        Longitude = st.slider(
+            "🧭  Longitude (East — West)",
+            **SLIDERS["Longitude"], value=-118.0,
+            help="More negative = closer to the Pacific coast. LA is about -118.2"
+        )
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+    # ── Step 2 — Property ──────────────────────────────────────────────────────
     st.markdown("""
-    <div class="tip">
-        <span class="tip-i">💵</span>
-        <span><strong>Income is key</strong> — wealthier neighborhoods almost always have higher property values.</span>
-    </div>
-    <div class="tip">
-        <span class="tip-i">🏡</span>
-        <span><strong>Age matters</strong> — newer homes tend to be worth more, while older ones may need renovation.</span>
-    </div>
-    <div class="tip">
-        <span class="tip-i">🌊</span>
-        <span><strong>Coast = premium</strong> — properties closer to the Pacific (more negative longitude) are typically pricier.</span>
+    <div class="sec-header">
+        <div class="sec-dot">2</div>
+        <div class="sec-title">About the Property</div>
     </div>
-    <div class="tip">
-        <span class="tip-i">🛋️</span>
-        <span><strong>Room count</strong> — more rooms generally means a larger home and a higher price tag.</span>
+    <div class="sec-desc">Details about the house — age, size, and rooms.</div>
+    """, unsafe_allow_html=True)
+
+    col3, col4 = st.columns(2, gap="large")
+
+    with col3:
+        st.markdown('<div class="card"><div class="card-tag">Property Details</div>', unsafe_allow_html=True)
+        HouseAge = st.slider(
+            "🗓️  Age of the House (years)",
+            **SLIDERS["HouseAge"], value=20,
+            help="How old the property is. Newer homes are generally valued higher."
+        )
+        AveRooms = st.slider(
+            "🛋️  Average Rooms per House",
+            **SLIDERS["AveRooms"], value=5.0,
+            help="Typical number of rooms in homes in this area. A family home usually has 5–7."
+        )
+        AveBedrms = st.slider(
+            "🛏️  Average Bedrooms per House",
+            **SLIDERS["AveBedrms"], value=1.0,
+            help="Typical number of bedrooms in homes in this area."
+        )
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col4:
+        # Filled in below, once we know whether there is an estimate to explain.
+        tips_slot = st.empty()
+
+
+
+    # ── Step 3 — Predict ───────────────────────────────────────────────────────
+    st.markdown("""
+    <div class="sec-header" style="margin-top:1.5rem;">
+        <div class="sec-dot">3</div>
+        <div class="sec-title">Get Your Estimate</div>
     </div>
+    <div class="sec-desc">Click below — your result will appear instantly.</div>
     """, unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
 
+    clicked = st.button("🏡  Estimate Property Value", use_container_width=True)
+
+    inputs = (MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude)
+    result = st.session_state.get("estimate")
+    current = result is not None and result["inputs"] == inputs \
+        and result["version"] == bundle.version
+    if clicked:
+        metrics.count("homevalue_estimates_total", "Estimate button presses.")
+        if not current:
+            result = st.session_state["estimate"] = estimate(bundle, comparables, drift, inputs)
+            current = True
+
+    if current:
+        with metrics.timed("render"):
+            st.markdown(result["html"], unsafe_allow_html=True)
+            if result["comparables"] is not None:
+                st.markdown('<div class="card-tag">Comparable blocks nearby</div>',
+                            unsafe_allow_html=True)
+                st.dataframe(result["comparables"], hide_index=True, use_container_width=True)
+
+    explained = current and result["tips"] is not None
+    with tips_slot.container():
+        tag = "What Drives This Estimate" if explained else "Helpful Tips"
+        st.markdown(f'<div class="card"><div class="card-tag">{tag}</div>', unsafe_allow_html=True)
+        st.markdown(result["tips"] if explained else TIPS_HTML, unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+    # ── What if ────────────────────────────────────────────────────────────────
+    st.markdown("""
+    <div class="sec-header" style="margin-top:1.5rem;">
+        <div class="sec-dot" style="background:var(--accent);">↔</div>
+        <div class="sec-title">What If…</div>
+    </div>
+    <div class="sec-desc">See how the estimate moves as one detail changes, with everything else as entered above.</div>
+    """, unsafe_allow_html=True)
 
-# ── Step 3 — Predict ──────────────────────────────────────────────────────────
-st.markdown("""
-<div class="sec-header" style="margin-top:1.5rem;">
-    <div class="sec-dot">3</div>
-    <div class="sec-title">Get Your Estimate</div>
-</div>
-<div class="sec-desc">Click below — your result will appear instantly.</div>
-""", unsafe_allow_html=True)
+    sweep_feature = st.selectbox("Vary", list(SWEEP_LABELS), format_func=SWEEP_LABELS.get)
+    with metrics.timed("sweep"):
+        curve = price_curve(bundle.version, inputs, sweep_feature, bundle)
+    st.vega_lite_chart(curve, curve_spec(sweep_feature))
+    metrics.observe("estimator", time.perf_counter() - start)
 
-clicked = st.button("🏡  Estimate Property Value", use_container_width=True)
 
-if clicked:
-    features = np.array([[MedInc, HouseAge, AveRooms, AveBedrms,
-                          Population, AveOccup, Latitude, Longitude]])
-    features_scaled = scaler.transform(features)
-    prediction = model.predict(features_scaled)[0]
-    price = prediction * 100_000
+estimator()
 
-    if price < 120_000:
-        tier, tier_bg = "Budget Friendly",  "rgba(91,123,106,0.85)"
-    elif price < 250_000:
-        tier, tier_bg = "Mid Range",        "rgba(70,130,160,0.85)"
-    elif price < 450_000:
-        tier, tier_bg = "Above Average",    "rgba(196,149,106,0.9)"
-    elif price < 700_000:
-        tier, tier_bg = "Premium",          "rgba(175,95,65,0.85)"
-    else:
-        tier, tier_bg = "Luxury",           "rgba(135,85,160,0.85)"
-
-    income_fmt = f"${MedInc * 10_000:,.0f}/yr"
-    loc_fmt = f"{Latitude:.1f}°N, {abs(Longitude):.1f}°W"
-
-    st.markdown(f"""
-    <div class="result-wrap">
-        <div class="res-eyebrow">Estimated Market Value</div>
-        <div class="res-price"><em>${price:,.0f}</em></div>
-        <div class="res-tier" style="background:{tier_bg};">{tier}</div>
-        <div class="res-pills">
-            <div class="res-pill">🗓️ {HouseAge} yrs old</div>
-            <div class="res-pill">🛋️ {AveRooms:.1f} rooms</div>
-            <div class="res-pill">💵 {income_fmt} area</div>
-            <div class="res-pill">📍 {loc_fmt}</div>
-        </div>
-        <div class="res-note">
-            This is an AI estimate for informational purposes only.<br>
-            Actual values depend on market conditions, property specifics, and more.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
 
 
 # ── How it works ───────────────────────────────────────────────────────────────
@@ -707,4 +915,6 @@ st.markdown("""
     <a href="https://linkedin.com/in/jad-walid-mrad" target="_blank">LinkedIn</a>
     <div class="footer-role">Computer Engineering Student · BAU Lebanon</div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+metrics.observe("page", time.perf_counter() - page_start)
\ No newline at end of file
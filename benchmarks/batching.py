@@ -0,0 +1,68 @@
+"""Throughput of concurrent single-row predictions with and without micro-batching.
+
+    python benchmarks/batching.py [--threads 1 8 32] [--window-ms 2] [--max-batch 64]
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.batching import MicroBatcher  # noqa: E402
+from homevalue.train import load_or_train, split_data  # noqa: E402
+
+
+def hammer(predict_one, rows, n_threads):
+    latencies = []
+    lock = threading.Lock()
+
+    def work(chunk):
+        local = []
+        for row in chunk:
+            start = time.perf_counter()
+            predict_one(row)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=work, args=(rows[i::n_threads],))
+               for i in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1e3
+    return len(rows) / elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    bundle = load_or_train()
+    rows = list(split_data()[1][:args.rows])
+    batcher = MicroBatcher(bundle.predict, args.max_batch, args.window_ms)
+    paths = {"direct": lambda row: bundle.predict(row)[0], "batched": batcher.predict_one}
+
+    print(f"{'threads':>7} {'path':<8} {'rows/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for n_threads in args.threads:
+        for name, fn in paths.items():
+            rate, p50, p99 = hammer(fn, rows, n_threads)
+            print(f"{n_threads:>7} {name:<8} {rate:>10,.0f} {p50:>8.2f} {p99:>8.2f}")
+    stats = batcher.stats()
+    print(f"mean batch size {stats['mean_batch_size']:.1f} over {stats['batches']} batches")
+    batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Bulk prediction throughput: packed binary vs. JSON.
+
+    python benchmarks/bulk.py [--rows 1000 10000 100000] [--repeat 3]
+
+Starts the API in-process and sends the same rows as JSON ``instances``
+(in requests of at most MAX_INSTANCES rows) and as one packed float32
+``/predict/bulk`` body. Reports end-to-end rows/s, including client encoding
+and decoding. It also reports the server-side codec time per row for each
+format: parsing and validating the request and encoding the response,
+without the model. Packed and JSON prices are checked to agree.
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue import FEATURES, SLIDERS, bulk  # noqa: E402
+from homevalue.api import (MAX_INSTANCES, PredictionService, make_server,  # noqa: E402
+                           parse_payload)
+from homevalue.tiers import tier_codes  # noqa: E402
+from homevalue.train import load_or_train, split_data  # noqa: E402
+
+
+def timed_best(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def post(conn, path, body, content_type):
+    conn.request("POST", path, body, {"Content-Type": content_type})
+    response = conn.getresponse()
+    data = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"{path}: {response.status} {data[:200]!r}")
+    return data
+
+
+def via_json(conn, X):
+    prices = []
+    for start in range(0, len(X), MAX_INSTANCES):
+        body = json.dumps({"instances": X[start:start + MAX_INSTANCES].tolist()})
+        prices += json.loads(post(conn, "/predict", body, "application/json"))["prices"]
+    prices = np.array(prices)
+    return prices, tier_codes(prices)
+
+
+def via_packed(conn, X):
+    data = post(conn, "/predict/bulk?dtype=float32", bulk.encode_rows(X), bulk.CONTENT_TYPE)
+    return bulk.decode_result(data)
+
+
+def json_codec(X, prices):
+    for start in range(0, len(X), MAX_INSTANCES):
+        block = slice(start, start + MAX_INSTANCES)
+        body = json.dumps({"instances": X[block].tolist()}).encode()
+        parse_payload(json.loads(body))
+        json.dumps({"version": "v", "prices": prices[block].tolist()}).encode()
+
+
+def packed_codec(X, prices):
+    body = bulk.encode_rows(X)
+    rows = np.asarray(bulk.decode_rows(body), dtype=np.float64)
+    bulk.check_rows(rows)
+    bulk.encode_result(prices, tier_codes(prices))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    bundle = load_or_train()
+    service = PredictionService(bundle)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=300)
+
+    X_test = split_data()[1]
+    # Clip to the ranges the API accepts, and round trip through float32 so
+    # that both formats predict exactly the same rows.
+    low = [SLIDERS[name]["min_value"] for name in FEATURES]
+    high = [SLIDERS[name]["max_value"] for name in FEATURES]
+    base = np.clip(X_test, low, high).astype(np.float32).astype(np.float64)
+    print(f"model {bundle.version}")
+    print(f"{'rows':>8} {'JSON rows/s':>12} {'packed rows/s':>14} {'speed-up':>9} "
+          f"{'JSON codec ns/row':>18} {'packed codec ns/row':>20}")
+    for n in args.rows:
+        X = np.tile(base, (int(np.ceil(n / len(base))), 1))[:n]
+        json_seconds, (json_prices, json_tiers) = timed_best(lambda: via_json(conn, X),
+                                                             args.repeat)
+        packed_seconds, (prices, tiers) = timed_best(lambda: via_packed(conn, X), args.repeat)
+        assert np.allclose(prices, json_prices, rtol=1e-6), "packed and JSON prices differ"
+        assert np.array_equal(tiers, json_tiers), "packed and JSON tiers differ"
+        reference = bundle.predict(X) * 100_000
+        json_codec_s, _ = timed_best(lambda: json_codec(X, reference), args.repeat)
+        packed_codec_s, _ = timed_best(lambda: packed_codec(X, reference), args.repeat)
+        print(f"{n:>8,} {n / json_seconds:>12,.0f} {n / packed_seconds:>14,.0f} "
+              f"{json_seconds / packed_seconds:>8.1f}x {json_codec_s / n * 1e9:>18,.0f} "
+              f"{packed_codec_s / n * 1e9:>20,.0f}")
+    conn.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
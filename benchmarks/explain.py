@@ -0,0 +1,65 @@
+"""Latency of per-feature contributions vs. plain prediction.
+
+    python benchmarks/explain.py [--naive-rows 50]
+
+Checks the vectorized tree-path contributions against a straightforward
+reference (sklearn ``decision_path`` per tree, Python loop over path nodes) and
+that they add up to the prediction, then times both at several batch sizes.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from intervals import best_of  # noqa: E402
+
+from homevalue.train import load_or_train, split_data  # noqa: E402
+
+
+def naive_contributions(bundle, X):
+    X = bundle.scaler.transform(X)
+    out = np.zeros(X.shape)
+    for estimator in bundle.model.estimators_:
+        tree = estimator.tree_
+        values = tree.value[:, 0, 0]
+        paths = estimator.decision_path(X)
+        for row in range(len(X)):
+            nodes = paths.indices[paths.indptr[row]:paths.indptr[row + 1]]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                out[row, tree.feature[parent]] += values[child] - values[parent]
+    return out / len(bundle.model.estimators_)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--naive-rows", type=int, default=50,
+                        help="rows to time the naive reference on (it is slow)")
+    args = parser.parse_args(argv)
+
+    bundle = load_or_train()
+    X_test = split_data()[1]
+    bias, contributions = bundle.contributions(X_test)
+    assert np.allclose(bias + contributions.sum(axis=1), bundle.predict(X_test),
+                       rtol=0, atol=1e-9), "contributions do not add up to the prediction"
+    naive = naive_contributions(bundle, X_test[:args.naive_rows])
+    assert np.allclose(naive, contributions[:args.naive_rows], rtol=0, atol=1e-9), \
+        "vectorized and naive contributions differ"
+    bundle.forest.node_deltas()
+
+    print(f"{'rows':>6} {'predict ms':>11} {'explain ms':>11} {'rows/s':>10} {'naive ms':>10}")
+    for n, repeat in ((1, 200), (64, 20), (1000, 5), (len(X_test), 3)):
+        X = X_test[:n]
+        plain = best_of(bundle.predict_flat, X, repeat)
+        explain = best_of(bundle.contributions, X, repeat)
+        naive = ""
+        if n <= args.naive_rows:
+            naive = f"{best_of(lambda X: naive_contributions(bundle, X), X, 3) * 1e3:>10.1f}"
+        print(f"{n:>6} {plain * 1e3:>11.2f} {explain * 1e3:>11.2f} "
+              f"{n / explain:>10,.0f} {naive:>10}")
+
+
+if __name__ == "__main__":
+    main()
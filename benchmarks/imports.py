@@ -0,0 +1,65 @@
+"""Import-time profile of the serving path (``python -X importtime``).
+
+    python benchmarks/imports.py [--top 15] [--repeat 3]
+
+Imports the homevalue modules the app and the API load at startup in a fresh
+interpreter, and reports their total import time, how many modules they pull
+in, the slowest ones, and whether training-only packages (scikit-learn,
+joblib, scipy.stats) were imported. Interpreter startup imports are excluded.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SERVING_MODULES = ("homevalue.api", "homevalue.cache", "homevalue.drift", "homevalue.geo",
+                   "homevalue.reload", "homevalue.sensitivity", "homevalue.train")
+TRAINING_ONLY = ("sklearn", "joblib", "scipy.stats")
+
+
+def _importtime(code):
+    """[(self_us, cumulative_us, name, depth)] for one fresh interpreter."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                         check=True, capture_output=True, text=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(own), int(cumulative), name.strip(), depth))
+    return rows
+
+
+def profile(modules=SERVING_MODULES):
+    """(seconds, modules imported, [(self_us, cumulative_us, name, depth)])."""
+    startup = {name for _, _, name, _ in _importtime("pass")}
+    rows = [row for row in _importtime("import " + ", ".join(modules))
+            if row[2] not in startup]
+    seconds = sum(cumulative for _, cumulative, _, depth in rows if depth == 0) / 1e6
+    return seconds, len(rows), rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    runs = [profile() for _ in range(args.repeat)]
+    _, n_modules, rows = min(runs, key=lambda run: run[0])
+    print(f"serving imports: {statistics.median(r[0] for r in runs) * 1e3:.0f} ms median, "
+          f"{n_modules} modules")
+    names = {name for _, _, name, _ in rows}
+    heavy = [package for package in TRAINING_ONLY if package in names]
+    print(f"training-only packages imported: {', '.join(heavy) if heavy else 'none'}")
+    print(f"\n{'self ms':>8} {'cumul ms':>9}  module")
+    for own, cumulative, name, depth in sorted(rows, key=lambda r: -r[0])[:args.top]:
+        print(f"{own / 1e3:>8.1f} {cumulative / 1e3:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Single-row latency and batch throughput: sklearn vs. the flat-array forest.
+
+The flat path takes raw features (scaler folded into the thresholds); the
+sklearn path runs ``scaler.transform`` + ``model.predict``.
+
+    python benchmarks/inference.py [--rows 500]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.artifact import load_bundle  # noqa: E402
+from homevalue.train import split_data  # noqa: E402
+from homevalue.validate import check_parity  # noqa: E402
+
+
+def latencies(fn, rows, warmup=20):
+    for row in rows[:warmup]:
+        fn(row)
+    samples = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter_ns()
+        fn(row)
+        samples[i] = time.perf_counter_ns() - start
+    return samples / 1e3  # µs
+
+
+def throughput(fn, X, repeat=3):
+    best = min(_timed(fn, X) for _ in range(repeat))
+    return len(X) / best
+
+
+def _timed(fn, X):
+    start = time.perf_counter()
+    fn(X)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="single-row samples per path")
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle()
+    X_test = split_data()[1]
+    mismatches = check_parity(bundle, X_test)
+    print(f"parity on test split: {len(X_test) - mismatches}/{len(X_test)} identical")
+
+    rows = [X_test[i:i + 1] for i in range(min(args.rows, len(X_test)))]
+    paths = {
+        "sklearn": bundle.predict_reference,
+        "flat": bundle.predict_flat,
+        "bundle": bundle.predict,  # what the app and API call: flat at every size
+    }
+    print(f"{'path':<8} {'p50 µs':>10} {'p99 µs':>10} {'batch rows/s':>14}")
+    for name, fn in paths.items():
+        lat = latencies(fn, rows)
+        print(f"{name:<8} {np.percentile(lat, 50):>10.1f} {np.percentile(lat, 99):>10.1f} "
+              f"{throughput(fn, X_test):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
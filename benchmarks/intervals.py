@@ -0,0 +1,43 @@
+"""Overhead of per-tree prediction intervals over the plain predict call.
+
+    python benchmarks/intervals.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.train import load_or_train, split_data  # noqa: E402
+
+
+def best_of(fn, X, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    bundle = load_or_train()
+    X_test = split_data()[1]
+    mean, _, _ = bundle.predict_interval(X_test)
+    assert np.array_equal(mean, bundle.predict_flat(X_test)), "interval mean != predict"
+
+    print(f"{'rows':>6} {'predict ms':>11} {'flat ms':>9} {'interval ms':>12} {'overhead':>9}")
+    for n, repeat in ((1, 200), (64, 20), (len(X_test), 3)):
+        X = X_test[:n]
+        plain = best_of(bundle.predict, X, repeat)
+        flat = best_of(bundle.predict_flat, X, repeat)
+        interval = best_of(bundle.predict_interval, X, repeat)
+        print(f"{n:>6} {plain * 1e3:>11.2f} {flat * 1e3:>9.2f} {interval * 1e3:>12.2f} "
+              f"{interval / flat - 1:>+9.0%}")
+    print("overhead is relative to the flat forest, which computes the same tree outputs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Load test for the JSON prediction API.
+
+    python benchmarks/load_test.py --spawn                      # start a local instance
+    python benchmarks/load_test.py --url http://host:8000 --concurrency 16 --batch 32
+
+Each worker thread keeps one persistent connection and sends requests
+back to back; throughput and latency percentiles are reported at the end.
+"""
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homevalue import FEATURES, SLIDERS  # noqa: E402
+
+
+def random_rows(n, rng):
+    rows = []
+    for _ in range(n):
+        row = {}
+        for name in FEATURES:
+            spec = SLIDERS[name]
+            steps = int((spec["max_value"] - spec["min_value"]) / spec["step"] + 1e-9)
+            k = int(rng.integers(0, steps + 1))
+            row[name] = round(spec["min_value"] + k * spec["step"], 4)
+        rows.append(row)
+    return rows
+
+
+def make_bodies(n, batch, seed=0):
+    rng = np.random.default_rng(seed)
+    if batch == 1:
+        return [json.dumps({"features": r}).encode() for r in random_rows(n, rng)]
+    return [json.dumps({"instances": random_rows(batch, rng)}).encode() for _ in range(n)]
+
+
+def worker(host, port, bodies, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        start = time.perf_counter()
+        conn.request("POST", "/predict", body, headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            errors.append(response.status)
+    conn.close()
+
+
+def run(url, concurrency, requests, batch):
+    parts = urlsplit(url)
+    bodies = make_bodies(requests, batch)
+    latencies, errors = [], []
+    threads = [threading.Thread(target=worker, args=(parts.hostname, parts.port,
+                                                     bodies[i::concurrency], latencies, errors))
+               for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "rows_per_s": len(latencies) * batch / elapsed,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+        "p99_ms": float(np.percentile(lat, 99)),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(extra_args=()):
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "homevalue.api", "--port", str(port),
+                             *extra_args], cwd=ROOT)
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("API did not become healthy in time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="start a local API instance")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1, help="rows per request")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="micro-batching window of the spawned instance")
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if args.spawn:
+        proc, url = spawn_server(["--batch-window-ms", str(args.batch_window_ms)])
+    try:
+        result = run(url, args.concurrency, args.requests, args.batch)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print(f"{result['requests']} requests ({result['errors']} errors) in "
+          f"{result['seconds']:.2f}s with concurrency {args.concurrency}, batch {args.batch}")
+    print(f"throughput  {result['requests_per_s']:,.0f} req/s  {result['rows_per_s']:,.0f} rows/s")
+    print(f"latency     p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+          f"p99 {result['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
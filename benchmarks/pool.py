@@ -0,0 +1,63 @@
+"""Throughput and memory of the multi-process worker pool vs. worker count.
+
+    python benchmarks/pool.py [--workers 1 2 4 8] [--rows 200000]
+
+For each worker count, scores the same batch through a WorkerPool and reports
+rows/s, speed-up over one worker, and per-worker memory: RSS, PSS (RSS with
+shared pages split between the processes mapping them) and private bytes.
+Needs a published artifact. Scaling is bounded by the machine's core count.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.artifact import load_bundle  # noqa: E402
+from homevalue.pool import WorkerPool  # noqa: E402
+from homevalue.train import split_data  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle()
+    X_test = split_data()[1]
+    X = np.tile(X_test, (int(np.ceil(args.rows / len(X_test))), 1))[:args.rows]
+    expected = bundle.predict(X)
+    forest_mb = sum(a.nbytes for a in (bundle.forest.feature, bundle.forest.threshold,
+                                       bundle.forest.left, bundle.forest.right,
+                                       bundle.forest.value)) / 2**20
+    print(f"model {bundle.version}, forest arrays {forest_mb:.1f} MiB, "
+          f"{os.cpu_count()} CPUs, {args.rows:,} rows")
+
+    print(f"{'workers':>7} {'rows/s':>11} {'speed-up':>8} "
+          f"{'RSS MiB':>8} {'PSS MiB':>8} {'private':>8}")
+    base = None
+    for n in args.workers:
+        with WorkerPool(n, version=bundle.version) as pool:
+            memory = list(pool.warm().values())
+            assert np.array_equal(pool.predict(X), expected)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pool.predict(X)
+                best = min(best, time.perf_counter() - start)
+        rate = args.rows / best
+        base = base or rate
+        mean = {key: np.mean([m.get(key, np.nan) for m in memory])
+                for key in ("Rss", "Pss", "Private_Clean", "Private_Dirty")}
+        print(f"{n:>7} {rate:>11,.0f} {rate / base:>7.2f}x {mean['Rss']:>8.1f} "
+              f"{mean['Pss']:>8.1f} {mean['Private_Clean'] + mean['Private_Dirty']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Server time per Streamlit rerun of app.py.
+
+    python benchmarks/rerun.py [--repeat 10]
+
+Drives the app headlessly with Streamlit's AppTest and times the script run
+for each interaction: first load, moving a slider, estimating, estimating
+again with unchanged inputs, and switching the What-If feature. AppTest always
+reruns the whole script, so the ``page`` column is the cost of a full rerun;
+``estimator`` is the share spent in the estimator fragment, which is all a
+live session reruns when one of the fragment's own widgets changes.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from homevalue import metrics  # noqa: E402
+
+
+def _stage_seconds(stage):
+    histogram = metrics.REGISTRY.histogram(
+        "homevalue_stage_seconds", "Time spent in each estimator stage.", stage=stage)
+    return histogram.sum, sum(histogram.counts)
+
+
+def timed_run(at):
+    """(wall ms, page ms, estimator ms) of one script run."""
+    before = {s: _stage_seconds(s) for s in ("page", "estimator")}
+    start = time.perf_counter()
+    at.run()
+    wall = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    stages = []
+    for stage in ("page", "estimator"):
+        (total, n), (total0, n0) = _stage_seconds(stage), before[stage]
+        stages.append((total - total0) * 1e3 if n > n0 else float("nan"))
+    return (wall * 1e3, *stages)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    results = {}
+    for i in range(args.repeat):
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=300)
+        steps = [
+            ("load", lambda: None),
+            ("slider", lambda: at.slider[0].set_value(at.slider[0].value + 1)),
+            ("estimate", lambda: at.button[0].click()),
+            ("estimate again", lambda: at.button[0].click()),
+            ("what-if", lambda: at.selectbox[0].select("Latitude")),
+        ]
+        for name, interact in steps:
+            if name != "load":
+                interact()
+            results.setdefault(name, []).append(timed_run(at))
+
+    print(f"{'interaction':<15} {'wall ms':>9} {'page ms':>9} {'estimator ms':>13}")
+    for name, runs in results.items():
+        # The first iteration pays for model loading and warm-up; skip it if we can.
+        runs = runs[1:] or runs
+        wall, page, estimator = (statistics.median(column) for column in zip(*runs))
+        print(f"{name:<15} {wall:>9.1f} {page:>9.1f} {estimator:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
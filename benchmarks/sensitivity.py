@@ -0,0 +1,48 @@
+"""Cost of batched what-if sweeps vs. single-row predictions.
+
+    python benchmarks/sensitivity.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.sensitivity import sweep, sweep_2d  # noqa: E402
+from homevalue.train import load_or_train  # noqa: E402
+
+BASE = [5.0, 20, 5.0, 1.0, 1000, 3.0, 34.0, -118.0]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    bundle = load_or_train()
+    single = best_of(lambda: bundle.predict(np.array([BASE])), repeat=50)
+    reference = best_of(lambda: bundle.predict_reference(np.array([BASE])), repeat=10)
+    print(f"single-row predict (sklearn)    {reference * 1e3:8.2f} ms")
+    print(f"single-row predict              {single * 1e3:8.2f} ms")
+    cases = {
+        "1D MedInc (every step)": lambda: sweep(bundle.predict, BASE, "MedInc"),
+        "1D Longitude, 1,000 points": lambda: sweep(bundle.predict, BASE, "Longitude", 1000),
+        "2D Lat x Lon, 100 x 100": lambda: sweep_2d(bundle.predict, BASE, "Latitude",
+                                                    "Longitude", 100, 100),
+    }
+    for name, fn in cases.items():
+        points = fn().prices.size
+        seconds = best_of(fn, repeat=3)
+        print(f"{name:<31} {seconds * 1e3:8.2f} ms  {points:>6,} points  "
+              f"= {seconds / single:6.1f} single predicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Cold-start benchmark: loading a published artifact vs. retraining.
+
+    python benchmarks/startup.py [--repeat 3]
+
+Each measurement runs in a fresh interpreter so import and page-cache effects
+match what a newly scheduled Streamlit replica sees.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SNIPPETS = {
+    "train": "from homevalue.train import train_model; train_model()",
+    "load_artifact": "from homevalue.artifact import load_bundle; load_bundle()",
+}
+
+TIMER = """
+import time
+_t = time.perf_counter()
+{body}
+print(time.perf_counter() - _t)
+"""
+
+
+def run_once(body):
+    out = subprocess.run([sys.executable, "-c", TIMER.format(body=body)],
+                         cwd=ROOT, check=True, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, body in SNIPPETS.items():
+        times = [run_once(body) for _ in range(args.repeat)]
+        results[name] = statistics.median(times)
+        print(f"{name:<14} median {results[name]:8.3f}s  "
+              f"(runs: {', '.join(f'{t:.3f}' for t in times)})")
+    print(f"speedup        {results['train'] / results['load_artifact']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
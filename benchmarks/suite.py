@@ -0,0 +1,159 @@
+"""Reproducible benchmark suite with a regression gate.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --output new.json --baseline results.json --threshold 0.15
+
+Measures cold-start time, serving import time (``-X importtime``), training
+time and peak RSS, single-row latency percentiles, batch throughput at several
+batch sizes and artifact size, and writes them to a JSON file. With
+--baseline, exits non-zero when any metric is worse than the baseline by more
+than --threshold (a fraction).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from imports import profile as import_profile  # noqa: E402
+from inference import latencies, throughput  # noqa: E402
+from startup import SNIPPETS, run_once  # noqa: E402
+
+from homevalue.artifact import ARTIFACT_ROOT, load_bundle  # noqa: E402
+from homevalue.train import split_data  # noqa: E402
+
+BATCH_SIZES = (1, 16, 256, 4096)
+
+# Metrics ending in these suffixes are better when larger; all others when smaller.
+HIGHER_IS_BETTER = ("_rows_per_s",)
+
+TRAIN_SNIPPET = """
+import json, resource, time
+from homevalue.train import train_model
+start = time.perf_counter()
+train_model()
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def measure_training():
+    out = subprocess.run([sys.executable, "-c", TRAIN_SNIPPET], cwd=ROOT, check=True,
+                         capture_output=True, text=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return {"train_seconds": result["seconds"], "train_peak_rss_mb": result["peak_rss_mb"]}
+
+
+def measure_cold_start(repeat):
+    times = [run_once(SNIPPETS["load_artifact"]) for _ in range(repeat)]
+    return {"cold_start_seconds": statistics.median(times)}
+
+
+def measure_imports(repeat):
+    runs = [import_profile() for _ in range(repeat)]
+    return {"serving_import_seconds": statistics.median(run[0] for run in runs),
+            "serving_import_modules": runs[0][1]}
+
+
+def measure_inference(bundle, X_test, n_rows):
+    rows = [X_test[i:i + 1] for i in range(min(n_rows, len(X_test)))]
+    lat = latencies(bundle.predict, rows)
+    metrics = {
+        "single_row_p50_us": float(np.percentile(lat, 50)),
+        "single_row_p99_us": float(np.percentile(lat, 99)),
+    }
+    reps = int(np.ceil(max(BATCH_SIZES) / len(X_test)))
+    pool = np.tile(X_test, (reps, 1))
+    for size in BATCH_SIZES:
+        batch = pool[:size]
+        calls = max(1, 2048 // size)
+        rate = throughput(lambda X: [bundle.predict(X) for _ in range(calls)], batch)
+        metrics[f"batch_{size}_rows_per_s"] = rate * calls
+    return metrics
+
+
+def measure_artifact(bundle, root):
+    directory = Path(root) / bundle.version
+    size = sum(p.stat().st_size for p in directory.rglob("*") if p.is_file())
+    return {"artifact_mb": size / 1e6}
+
+
+def environment(bundle):
+    import sklearn
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model_version": bundle.version,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def higher_is_better(name):
+    return name.endswith(HIGHER_IS_BETTER)
+
+
+def compare(current, baseline, threshold):
+    """List of (metric, baseline, current, change, regressed)."""
+    rows = []
+    for name, value in current.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        change = (value - base) / base if base else 0.0
+        worse = -change if higher_is_better(name) else change
+        rows.append((name, base, value, change, worse > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results file to gate against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative slowdown per metric (default 0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=3, help="cold-start repetitions")
+    parser.add_argument("--rows", type=int, default=500, help="single-row latency samples")
+    parser.add_argument("--skip-train", action="store_true", help="skip the training run")
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle()
+    X_test = split_data()[1]
+    metrics = {}
+    metrics.update(measure_cold_start(args.repeat))
+    metrics.update(measure_imports(args.repeat))
+    if not args.skip_train:
+        metrics.update(measure_training())
+    metrics.update(measure_inference(bundle, X_test, args.rows))
+    metrics.update(measure_artifact(bundle, ARTIFACT_ROOT))
+
+    results = {"environment": environment(bundle), "metrics": metrics}
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    for name, value in metrics.items():
+        print(f"{name:<28} {value:>14,.3f}")
+    print(f"wrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["metrics"]
+        rows = compare(metrics, baseline, args.threshold)
+        print(f"\n{'metric':<28} {'baseline':>14} {'current':>14} {'change':>8}")
+        for name, base, value, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<28} {base:>14,.3f} {value:>14,.3f} {change:>+8.1%}{flag}")
+        if any(row[4] for row in rows):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Per-row cost of tier classification and result formatting.
+
+    python benchmarks/tiers.py [--rows 1 1000 1000000]
+
+Times the per-row Python the app used (an if/elif tier chain and f-strings
+for the price and location) against the table-driven, vectorized
+``homevalue.tiers`` and ``homevalue.formatting`` on the same prices, and
+checks that both give identical results.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homevalue.formatting import location, usd  # noqa: E402
+from homevalue.tiers import tier_codes, tier_names  # noqa: E402
+
+
+def tier_chain(price):
+    if price < 120_000:
+        return "Budget Friendly"
+    elif price < 250_000:
+        return "Mid Range"
+    elif price < 450_000:
+        return "Above Average"
+    elif price < 700_000:
+        return "Premium"
+    return "Luxury"
+
+
+def per_row(name, prices, lat, lon):
+    if name == "tier":
+        return [tier_chain(p) for p in prices.tolist()]
+    if name == "price":
+        return [f"${p:,.0f}" for p in prices.tolist()]
+    return [f"{a:.1f}°N, {abs(b):.1f}°W" for a, b in zip(lat.tolist(), lon.tolist())]
+
+
+def vectorized(name, prices, lat, lon):
+    if name == "tier":
+        return tier_names(prices)
+    if name == "price":
+        return usd(prices)
+    return location(lat, lon)
+
+
+def best_ns(fn, n, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 1000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>9} {'field':<9} {'per-row ns':>11} {'vectorized ns':>14} {'speed-up':>9}")
+    for n in args.rows:
+        prices = rng.lognormal(12.3, 0.6, n)
+        lat, lon = rng.uniform(32, 42, n), rng.uniform(-124, -114, n)
+        repeat = args.repeat if n < 100_000 else 2
+        for name in ("tier", "price", "location"):
+            assert list(vectorized(name, prices, lat, lon)) == per_row(name, prices, lat, lon)
+            slow = best_ns(lambda: per_row(name, prices, lat, lon), n, repeat)
+            fast = best_ns(lambda: vectorized(name, prices, lat, lon), n, repeat)
+            print(f"{n:>9,} {name:<9} {slow:>11,.0f} {fast:>14,.1f} {slow / fast:>8.1f}x")
+        codes = best_ns(lambda: tier_codes(prices), n, repeat)
+        print(f"{n:>9,} {'codes':<9} {'':>11} {codes:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
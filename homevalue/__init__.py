@@ -0,0 +1,19 @@
+"""Shared building blocks for the HomeValue estimator."""
+
+# Column order the model is trained on; every caller must build feature rows
+# in exactly this order.
+FEATURES = ["MedInc", "HouseAge", "AveRooms", "AveBedrms",
+            "Population", "AveOccup", "Latitude", "Longitude"]
+
+# Ranges of the app's input sliders (st.slider keyword arguments). The API,
+# prediction cache and sensitivity sweeps validate and quantize against these.
+SLIDERS = {
+    "MedInc":     dict(min_value=0.5,    max_value=15.0,   step=0.1),
+    "HouseAge":   dict(min_value=1,      max_value=52,     step=1),
+    "AveRooms":   dict(min_value=1.0,    max_value=15.0,   step=0.1),
+    "AveBedrms":  dict(min_value=1.0,    max_value=5.0,    step=0.1),
+    "Population": dict(min_value=3,      max_value=35000,  step=50),
+    "AveOccup":   dict(min_value=1.0,    max_value=10.0,   step=0.1),
+    "Latitude":   dict(min_value=32.0,   max_value=42.0,   step=0.1),
+    "Longitude":  dict(min_value=-124.0, max_value=-114.0, step=0.1),
+}
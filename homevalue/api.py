@@ -0,0 +1,421 @@
+"""Lean JSON prediction service.
+
+    python -m homevalue.api --port 8000
+
+    GET  /health
+    GET  /stats     cache, micro-batcher and hot-reload counters
+    GET  /metrics   stage latency histograms, Prometheus text format
+    GET  /drift     input-drift scores (PSI per feature) vs. training data
+    GET  /surface?lat=34.0&lon=-118.0[&profile=typical]   precomputed price
+    GET  /comparables?lat=34.0&lon=-118.0[&k=5]           nearest training blocks
+    POST /predict   {"features": {"MedInc": 5.0, ..., "Longitude": -118.0}}
+                    {"features": [5.0, 20, 5.0, 1.0, 1000, 3.0, 34.0, -118.0]}
+                    {"instances": [<features>, <features>, ...]}
+                    add "interval": 0.9 for lower/upper bounds from the trees
+                    add "explain": true for per-feature contributions (USD)
+    POST /predict/bulk[?dtype=float32|float64]
+                    packed little-endian N x 8 feature rows in, packed prices
+                    and tier codes out (see ``homevalue.bulk``)
+
+Features are validated against the app's slider ranges. Prices are in USD.
+Newly published artifact versions are picked up without a restart (see
+``homevalue.reload``).
+"""
+import argparse
+import json
+import logging
+import math
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS, bulk, metrics
+from homevalue.cache import PredictionCache, row_key
+from homevalue.reload import RELOAD_INTERVAL
+from homevalue.tiers import tier_codes
+
+log = logging.getLogger(__name__)
+
+PRICE_UNIT = 100_000
+MAX_BODY_BYTES = 8 << 20
+MAX_INSTANCES = 10_000
+
+
+class ValidationError(ValueError):
+    pass
+
+
+def _row(features, where):
+    if isinstance(features, dict):
+        unknown = sorted(set(features) - set(FEATURES))
+        if unknown:
+            raise ValidationError(f"{where}: unknown feature(s) {', '.join(unknown)}")
+        missing = [name for name in FEATURES if name not in features]
+        if missing:
+            raise ValidationError(f"{where}: missing feature(s) {', '.join(missing)}")
+        values = [features[name] for name in FEATURES]
+    elif isinstance(features, list):
+        if len(features) != len(FEATURES):
+            raise ValidationError(f"{where}: expected {len(FEATURES)} values in "
+                                  f"order {', '.join(FEATURES)}")
+        values = features
+    else:
+        raise ValidationError(f"{where}: features must be an object or a list")
+
+    row = []
+    for name, value in zip(FEATURES, values):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValidationError(f"{where}: {name} must be a finite number")
+        try:
+            # Huge JSON integers overflow float.
+            value = float(value)
+        except OverflowError:
+            value = math.inf
+        if not math.isfinite(value):
+            raise ValidationError(f"{where}: {name} must be a finite number")
+        _check_range(name, value, where)
+        row.append(value)
+    return row
+
+
+def _check_range(name, value, where):
+    lo, hi = SLIDERS[name]["min_value"], SLIDERS[name]["max_value"]
+    if not lo <= value <= hi:
+        raise ValidationError(f"{where}: {name}={value} outside [{lo}, {hi}]")
+
+
+def parse_payload(payload):
+    """Validated (n, 8) float64 array and whether the request was a single row."""
+    if not isinstance(payload, dict):
+        raise ValidationError("Body must be a JSON object")
+    if "features" in payload:
+        return np.array([_row(payload["features"], "features")], dtype=np.float64), True
+    if "instances" in payload:
+        instances = payload["instances"]
+        if not isinstance(instances, list) or not instances:
+            raise ValidationError("instances must be a non-empty list")
+        if len(instances) > MAX_INSTANCES:
+            raise ValidationError(f"At most {MAX_INSTANCES} instances per request")
+        rows = [_row(item, f"instances[{i}]") for i, item in enumerate(instances)]
+        return np.array(rows, dtype=np.float64), False
+    raise ValidationError('Body needs "features" or "instances"')
+
+
+class PredictionService:
+    """Transport-independent prediction logic behind the HTTP handler.
+
+    A ``batcher`` must resolve each row to a (price, version) pair, like
+    ``predict_versioned``.
+    """
+
+    def __init__(self, bundle, cache=None, batcher=None, surface=None, comparables=None,
+                 drift=None):
+        self.bundle = bundle
+        self.drift = drift
+        # Any in-range value is accepted, so rows are cached on their exact
+        # values rather than on the app's slider grid.
+        self.cache = cache if cache is not None else PredictionCache(key=row_key)
+        self.batcher = batcher
+        self.surface = surface
+        self.comparables = comparables
+        self.watcher = None
+
+    def swap(self, bundle, surface=None, comparables=None, drift=None):
+        """Serve ``bundle`` from now on; running requests finish on the old one."""
+        old_drift = self.drift
+        self.surface, self.comparables, self.drift = surface, comparables, drift
+        self.bundle = bundle
+        if old_drift is not None:
+            old_drift.close()
+
+    def predict_versioned(self, X):
+        """(price, model version) per row, from whichever model is current."""
+        bundle = self.bundle
+        return [(price, bundle.version) for price in bundle.predict(X)]
+
+    def _predict_row(self, bundle, row):
+        if self.batcher is not None:
+            # The batch may run on a model swapped in after this request began.
+            return self.batcher.predict_one(row)
+        return bundle.predict(row)[0], bundle.version
+
+    def predict(self, payload):
+        with metrics.timed("parse"):
+            X, single = parse_payload(payload)
+        metrics.count("homevalue_api_rows_total", "Rows predicted by the API.", len(X))
+        bundle, drift = self.bundle, self.drift
+        if drift is not None:
+            drift.observe(X)
+        if "interval" in payload:
+            result = self._predict_interval(bundle, X, single, payload["interval"])
+        elif single:
+            version, value = bundle.version, self.cache.get(bundle.version, X[0])
+            if value is None:
+                value, version = self._predict_row(bundle, X[0])
+                self.cache.put(version, X[0], value)
+            result = {"version": version, "price": float(value) * PRICE_UNIT}
+        else:
+            prices = bundle.predict(X) * PRICE_UNIT
+            result = {"version": bundle.version, "prices": prices.tolist()}
+        if payload.get("explain"):
+            result.update(self._explain(bundle, X, single))
+        return result
+
+    def predict_packed(self, body, dtype="float32"):
+        """Bulk prediction in the packed format of ``homevalue.bulk``.
+
+        Returns (packed response, number of rows, model version).
+        """
+        with metrics.timed("parse"):
+            try:
+                X = np.asarray(bulk.decode_rows(body, dtype), dtype=np.float64)
+                bulk.check_rows(X)
+            except ValueError as exc:
+                raise ValidationError(str(exc))
+        metrics.count("homevalue_api_rows_total", "Rows predicted by the API.", len(X))
+        bundle, drift = self.bundle, self.drift
+        if drift is not None:
+            drift.observe(X)
+        prices = bundle.predict(X) * PRICE_UNIT
+        with metrics.timed("encode"):
+            data = bulk.encode_result(prices, tier_codes(prices), dtype)
+        return data, len(X), bundle.version
+
+    def _explain(self, bundle, X, single):
+        try:
+            bias, contributions = bundle.contributions(X)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+        rows = [dict(zip(FEATURES, row)) for row in (contributions * PRICE_UNIT).tolist()]
+        return {"base": bias * PRICE_UNIT,
+                "contributions": rows[0] if single else rows}
+
+    def _predict_interval(self, bundle, X, single, coverage):
+        if isinstance(coverage, bool) or not isinstance(coverage, (int, float)) \
+                or not 0 < coverage < 1:
+            raise ValidationError("interval must be a number between 0 and 1")
+        try:
+            mean, lower, upper = bundle.predict_interval(X, coverage)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+        result = {"version": bundle.version, "interval": coverage}
+        if single:
+            result.update(price=float(mean[0]) * PRICE_UNIT, lower=float(lower[0]) * PRICE_UNIT,
+                          upper=float(upper[0]) * PRICE_UNIT)
+        else:
+            result.update(prices=(mean * PRICE_UNIT).tolist(),
+                          lower=(lower * PRICE_UNIT).tolist(),
+                          upper=(upper * PRICE_UNIT).tolist())
+        return result
+
+    def _location(self, query):
+        try:
+            lat, lon = float(query["lat"][0]), float(query["lon"][0])
+        except (KeyError, ValueError):
+            raise ValidationError("lat and lon query parameters are required numbers")
+        _check_range("Latitude", lat, "lat")
+        _check_range("Longitude", lon, "lon")
+        return lat, lon
+
+    def surface_price(self, query):
+        if self.surface is None:
+            raise LookupError("No price surface built; run `python -m homevalue.geo build`")
+        lat, lon = self._location(query)
+        profile = query.get("profile", ["typical"])[0]
+        if profile not in self.surface.profiles:
+            raise ValidationError(f"profile must be one of {', '.join(self.surface.profiles)}")
+        return {"version": self.bundle.version, "profile": profile,
+                "price": float(self.surface.lookup(lat, lon, profile))}
+
+    def nearest(self, query):
+        if self.comparables is None:
+            raise LookupError("No comparables index built; run `python -m homevalue.geo build`")
+        lat, lon = self._location(query)
+        try:
+            k = int(query.get("k", ["5"])[0])
+        except ValueError:
+            raise ValidationError("k must be an integer")
+        if not 1 <= k <= 100:
+            raise ValidationError("k must be between 1 and 100")
+        return {"comparables": self.comparables.nearest(lat, lon, k)}
+
+    def health(self):
+        return {"status": "ok", "version": self.bundle.version}
+
+    def stats(self):
+        stats = {"cache": self.cache.stats()}
+        if self.batcher is not None:
+            stats["batcher"] = self.batcher.stats()
+        if self.watcher is not None:
+            stats["reload"] = self.watcher.stats()
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "HomeValueAPI/1"
+    service = None
+    quiet = True
+
+    def _send(self, status, body):
+        self._send_raw(status, json.dumps(body).encode(), "application/json")
+
+    def _send_raw(self, status, data, content_type, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        try:
+            method()
+        except Exception:
+            log.exception("Error handling %s %s", self.command, self.path)
+            self.close_connection = True
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"})
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+    def _get(self):
+        url = urlsplit(self.path)
+        if url.path in ("/surface", "/comparables"):
+            lookup = self.service.surface_price if url.path == "/surface" \
+                else self.service.nearest
+            try:
+                self._send(HTTPStatus.OK, lookup(parse_qs(url.query)))
+            except ValidationError as exc:
+                self._send(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+            except LookupError as exc:
+                self._send(HTTPStatus.NOT_FOUND, {"error": str(exc)})
+        elif url.path == "/health":
+            self._send(HTTPStatus.OK, self.service.health())
+        elif url.path == "/drift":
+            drift = self.service.drift
+            if drift is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": "Model has no training profile"})
+            else:
+                self._send(HTTPStatus.OK, drift.stats())
+        elif url.path == "/stats":
+            self._send(HTTPStatus.OK, self.service.stats())
+        elif url.path == "/metrics":
+            self._send_raw(HTTPStatus.OK, metrics.REGISTRY.render().encode(),
+                           metrics.CONTENT_TYPE)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def _post(self):
+        url = urlsplit(self.path)
+        if url.path not in ("/predict", "/predict/bulk"):
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        packed = url.path == "/predict/bulk"
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"})
+            return
+        if length > (bulk.MAX_BULK_BYTES if packed else MAX_BODY_BYTES):
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"})
+            return
+        if packed:
+            self._predict_packed(self.rfile.read(length), parse_qs(url.query))
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+            self._send(HTTPStatus.OK, self.service.predict(payload))
+        except json.JSONDecodeError:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Body is not valid JSON"})
+        except ValidationError as exc:
+            self._send(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+
+    def _predict_packed(self, body, query):
+        dtype = query.get("dtype", ["float32"])[0]
+        try:
+            data, n, version = self.service.predict_packed(body, dtype)
+        except ValidationError as exc:
+            self._send(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+            return
+        self._send_raw(HTTPStatus.OK, data, bulk.CONTENT_TYPE,
+                       (("X-Rows", n), ("X-Dtype", dtype), ("X-Model-Version", version)))
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(service, host="127.0.0.1", port=8000, quiet=True):
+    handler = type("Handler", (_Handler,), {"service": service, "quiet": quiet})
+    return _Server((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="coalesce concurrent single-row requests for up to this "
+                             "long (0 disables micro-batching)")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL,
+                        help="seconds between checks for a newly published model "
+                             "(0 disables hot reload)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    from homevalue.batching import MicroBatcher
+    from homevalue.drift import monitor_for
+    from homevalue.geo import load_geo
+    from homevalue.reload import ModelWatcher
+    from homevalue.train import load_or_train
+    bundle = load_or_train()
+    surface, comparables = load_geo(bundle)
+    service = PredictionService(bundle, surface=surface, comparables=comparables,
+                                drift=monitor_for(bundle))
+    if args.batch_window_ms > 0:
+        # Batches go to whichever model is current when they run.
+        service.batcher = MicroBatcher(service.predict_versioned, args.max_batch_size,
+                                       args.batch_window_ms)
+    if args.reload_interval > 0:
+        def on_swap(new):
+            service.swap(new, *load_geo(new), drift=monitor_for(new))
+            print(f"Serving model {new.version}")
+        service.watcher = ModelWatcher(bundle, interval=args.reload_interval,
+                                       on_swap=on_swap)
+
+    def drift_collector():
+        if service.drift is not None:
+            yield from service.drift.collector()()
+
+    metrics.REGISTRY.register_collector(metrics.cache_collector(service.cache))
+    metrics.REGISTRY.register_collector(drift_collector)
+    server = make_server(service, args.host, args.port, quiet=not args.verbose)
+    print(f"Serving model {service.bundle.version} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Versioned on-disk model artifacts.
+
+Layout of an artifact root::
+
+    models/
+        LATEST                  <- name of the current version
+        20260101-120000/
+            manifest.json       <- features, training metadata, checksums
+            model.joblib        <- (model, scaler)
+            forest/*.npy        <- flat-array forest with the scaler folded in,
+                                   memory-mapped
+
+When an artifact has a scaler-folded forest, ``load_bundle`` leaves
+``model.joblib`` on disk: joblib and scikit-learn are imported and the model
+is unpickled the first time the reference path is needed.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from homevalue import FEATURES, metrics
+from homevalue.forest import FlatForest
+
+ARTIFACT_ROOT = Path(os.environ.get(
+    "HOMEVALUE_MODEL_DIR", Path(__file__).resolve().parent.parent / "models"))
+FORMAT_VERSION = 2
+MODEL_FILE = "model.joblib"
+MANIFEST_FILE = "manifest.json"
+FOREST_DIR = "forest"
+# Above this many rows sklearn's compiled traversal outruns the NumPy engine;
+# both paths give bit-identical results, so routing is purely about speed.
+# Only offline batch scoring routes on it (``reference_batches``): serving
+# would have to load the sklearn model for it.
+FLAT_MAX_ROWS = 256
+LATEST_FILE = "LATEST"
+
+
+class ArtifactError(Exception):
+    pass
+
+
+class ArtifactNotFoundError(ArtifactError):
+    pass
+
+
+class ModelBundle:
+    """A fitted model plus everything needed to serve it.
+
+    ``predict`` uses the flat-array forest for every request when one is
+    available; ``predict_reference`` always goes through scaler + sklearn.
+    With ``reference_batches`` set (offline scoring), exact forests send
+    batches over ``FLAT_MAX_ROWS`` rows to sklearn, which is faster there.
+    Given ``model_path`` instead of a model, the (model, scaler) pair is
+    unpickled on first access of ``model`` or ``scaler``.
+    """
+
+    reference_batches = False
+
+    def __init__(self, model, scaler, manifest, forest=None, model_path=None):
+        self._model = model
+        self._scaler = scaler
+        self.manifest = manifest
+        self.forest = forest
+        self.model_path = model_path
+        self._load_lock = threading.Lock()
+
+    def _load_reference(self):
+        with self._load_lock:
+            if self._model is None:
+                import joblib
+                with metrics.timed("load_reference"):
+                    self._model, self._scaler = joblib.load(self.model_path)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._load_reference()
+        return self._model
+
+    @property
+    def scaler(self):
+        if self._model is None:
+            self._load_reference()
+        return self._scaler
+
+    @property
+    def version(self):
+        return self.manifest.get("version")
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        if self.forest is None or (self.reference_batches and self.forest.exact
+                                   and len(X) > FLAT_MAX_ROWS):
+            return self.predict_reference(X)
+        return self.predict_flat(X)
+
+    def predict_flat(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        if not self.forest.folded:
+            with metrics.timed("scale"):
+                X = self.scaler.transform(X)
+        with metrics.timed("model"):
+            return self.forest.predict(X)
+
+    def predict_interval(self, X, coverage=0.9):
+        """(prediction, lower, upper) with bounds at the central ``coverage``
+        quantiles of the individual trees' outputs. Needs a flat forest."""
+        if self.forest is None:
+            raise ValueError("Prediction intervals need an artifact with a flat forest")
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        if not self.forest.folded:
+            X = self.scaler.transform(X)
+        tail = (1 - coverage) / 2
+        with metrics.timed("interval"):
+            mean, (lower, upper) = self.forest.predict_interval(X, (tail, 1 - tail))
+        return mean, lower, upper
+
+    def contributions(self, X):
+        """(bias, per-feature contributions) from the flat forest; see
+        ``FlatForest.contributions``. Needs a flat forest."""
+        if self.forest is None:
+            raise ValueError("Explanations need an artifact with a flat forest")
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        if not self.forest.folded:
+            X = self.scaler.transform(X)
+        with metrics.timed("explain"):
+            return self.forest.contributions(X)
+
+    def predict_reference(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        with metrics.timed("scale"):
+            X = self.scaler.transform(X)
+        with metrics.timed("model"):
+            return self.model.predict(X)
+
+
+def export_forest(model, scaler):
+    """Scaler-folded FlatForest for tree ensembles, None for other models."""
+    if not hasattr(model, "estimators_") or not hasattr(model.estimators_[0], "tree_"):
+        return None
+    return FlatForest.from_sklearn(model).fold_scaler(scaler)
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_text_atomic(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def _new_version(root):
+    version = time.strftime("%Y%m%d-%H%M%S")
+    candidate, n = version, 1
+    while (root / candidate).exists():
+        candidate = f"{version}-{n}"
+        n += 1
+    return candidate
+
+
+def save_bundle(model, scaler, metadata=None, root=ARTIFACT_ROOT, forest=None):
+    """Write a new artifact version and point LATEST at it. Returns the version."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = _new_version(root)
+    staging = root / f".{version}.partial"
+    staging.mkdir()
+
+    import joblib
+    joblib.dump((model, scaler), staging / MODEL_FILE)
+    files = [MODEL_FILE]
+    forest = forest if forest is not None else export_forest(model, scaler)
+    if forest is not None:
+        files += [f"{FOREST_DIR}/{name}" for name in forest.save(staging / FOREST_DIR)]
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "features": FEATURES,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "metadata": metadata or {},
+        "files": {name: sha256_file(staging / name) for name in files},
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    os.replace(staging, root / version)
+    _write_text_atomic(root / LATEST_FILE, version + "\n")
+    return version
+
+
+def latest_version(root=ARTIFACT_ROOT):
+    try:
+        return (Path(root) / LATEST_FILE).read_text().strip()
+    except FileNotFoundError:
+        raise ArtifactNotFoundError(
+            f"No model artifact in {root}. Run `python -m homevalue.train` first.")
+
+
+def read_manifest(version, root=ARTIFACT_ROOT):
+    path = Path(root) / version / MANIFEST_FILE
+    try:
+        manifest = json.loads(path.read_text())
+    except FileNotFoundError:
+        raise ArtifactNotFoundError(f"Artifact version {version!r} not found in {root}")
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(
+            f"Unsupported artifact format {manifest.get('format_version')!r} in {path}; "
+            "retrain with `python -m homevalue.train`")
+    if manifest.get("features") != FEATURES:
+        raise ArtifactError(f"Artifact {version} was trained on a different feature order")
+    return manifest
+
+
+def verify_files(version, manifest, root=ARTIFACT_ROOT):
+    directory = Path(root) / version
+    for name, expected in manifest["files"].items():
+        actual = sha256_file(directory / name)
+        if actual != expected:
+            raise ArtifactError(f"Checksum mismatch for {directory / name}")
+
+
+def load_bundle(root=ARTIFACT_ROOT, version=None, verify=True):
+    version = version or latest_version(root)
+    manifest = read_manifest(version, root)
+    if verify:
+        verify_files(version, manifest, root)
+    directory = Path(root) / version
+    forest = None
+    if (directory / FOREST_DIR).is_dir():
+        forest = FlatForest.load(directory / FOREST_DIR, mmap_mode="r")
+    if forest is not None and forest.folded:
+        return ModelBundle(None, None, manifest, forest, model_path=directory / MODEL_FILE)
+    import joblib
+    model, scaler = joblib.load(directory / MODEL_FILE)
+    return ModelBundle(model, scaler, manifest, forest)
+
+
+def load_forest(root=ARTIFACT_ROOT, version=None):
+    """(version, memory-mapped scaler-folded forest) without unpickling sklearn.
+
+    Checksums are not re-verified; load the bundle once with ``load_bundle``
+    for that.
+    """
+    version = version or latest_version(root)
+    read_manifest(version, root)
+    directory = Path(root) / version / FOREST_DIR
+    if not directory.is_dir():
+        raise ArtifactError(f"Artifact {version} has no flat forest; retrain to export one")
+    forest = FlatForest.load(directory, mmap_mode="r")
+    if not forest.folded:
+        raise ArtifactError(f"Forest in artifact {version} needs the scaler; retrain")
+    return version, forest
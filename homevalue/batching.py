@@ -0,0 +1,130 @@
+"""Micro-batching for concurrent single-row predictions.
+
+Callers submit one feature row at a time. A background thread gathers
+everything that arrives within a short window (or until the batch is full),
+runs it through the model as a single vectorized call and resolves each
+caller's future with its own result. Rows whose caller has already cancelled
+(e.g. an ``asyncio`` task timed out) are dropped before the batch runs.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from homevalue import FEATURES
+
+log = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 10_000
+
+
+class MicroBatcher:
+
+    def __init__(self, predict, max_batch_size=64, max_wait_ms=2.0):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1e3
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self.rows = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    def submit(self, features):
+        """Queue one row; returns a Future resolving to its prediction."""
+        row = np.asarray(features, dtype=np.float64).reshape(len(FEATURES))
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._pending.append((row, future, time.perf_counter()))
+            if len(self._pending) >= self.max_batch_size or len(self._pending) == 1:
+                self._cond.notify()
+        return future
+
+    def predict_one(self, features, timeout=None):
+        return self.submit(features).result(timeout)
+
+    async def predict_async(self, features):
+        return await asyncio.wrap_future(self.submit(features))
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(len(self._pending), self.max_batch_size)
+            batch = [self._pending.popleft() for _ in range(n)]
+        # Running futures can no longer be cancelled, so resolving them below
+        # cannot fail.
+        return [item for item in batch if item[1].set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                self._serve(batch)
+            except Exception as exc:
+                # Never let one bad batch stop the thread or strand its callers.
+                log.exception("Micro-batch failed")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _serve(self, batch):
+        if not batch:
+            return
+        rows, futures, queued = zip(*batch)
+        try:
+            results = self.predict(np.stack(rows))
+        except Exception as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+        done = time.perf_counter()
+        for future, result in zip(futures, results, strict=True):
+            future.set_result(result)
+        self.batches += 1
+        self.rows += len(batch)
+        self._latencies.extend(done - t for t in queued)
+
+    def stats(self):
+        latencies = np.array(self._latencies) * 1e3
+        pct = (lambda q: float(np.percentile(latencies, q))) if len(latencies) else (lambda q: None)
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else None,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1e3,
+            "latency_p50_ms": pct(50),
+            "latency_p99_ms": pct(99),
+        }
+
+    def close(self):
+        """Stop accepting rows; queued rows are still served."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
@@ -0,0 +1,77 @@
+"""Packed binary format for bulk predictions.
+
+    POST /predict/bulk?dtype=float32        (or dtype=float64)
+    Content-Type: application/octet-stream
+
+The request body is N rows of 8 little-endian floats in ``FEATURES`` order
+(MedInc … Longitude), row-major with no header, e.g.
+``X.astype("<f4").tobytes()``. The response body is N prices in USD in the
+same dtype, followed by N uint8 tier codes indexing
+``homevalue.tiers.TIER_NAMES``; the ``X-Rows`` header carries N.
+
+The server wraps the body with ``np.frombuffer`` without copying it, checks
+every value against the slider ranges in one vectorized pass and predicts
+the whole batch at once, so decoding costs a small fraction of the model
+time. ``encode_rows`` and ``decode_result`` are the client side.
+"""
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS
+
+CONTENT_TYPE = "application/octet-stream"
+DTYPES = {"float32": np.dtype("<f4"), "float64": np.dtype("<f8")}
+MAX_BULK_BYTES = 128 << 20
+
+_LOW = np.array([SLIDERS[name]["min_value"] for name in FEATURES], dtype=np.float64)
+_HIGH = np.array([SLIDERS[name]["max_value"] for name in FEATURES], dtype=np.float64)
+
+
+def dtype_for(name):
+    try:
+        return DTYPES[name]
+    except KeyError:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}")
+
+
+def decode_rows(buffer, dtype="float32"):
+    """(n, 8) read-only view of a packed request body. Does not copy."""
+    dtype = dtype_for(dtype)
+    row_bytes = dtype.itemsize * len(FEATURES)
+    if not len(buffer) or len(buffer) % row_bytes:
+        raise ValueError(f"Body must be a non-empty multiple of {row_bytes} bytes "
+                         f"({len(FEATURES)} {dtype.name} values per row)")
+    return np.frombuffer(buffer, dtype=dtype).reshape(-1, len(FEATURES))
+
+
+def check_rows(X):
+    """Raise ValueError for the first row with a value outside the slider ranges."""
+    # NaN fails both comparisons, so non-finite values are caught too.
+    bad = ~((X >= _LOW) & (X <= _HIGH))
+    if bad.any():
+        row = int(np.flatnonzero(bad.any(axis=1))[0])
+        col = int(np.flatnonzero(bad[row])[0])
+        raise ValueError(f"rows[{row}]: {FEATURES[col]}={X[row, col]} outside "
+                         f"[{_LOW[col]:g}, {_HIGH[col]:g}]")
+
+
+def encode_result(prices, codes, dtype="float32"):
+    """Packed response: prices in ``dtype``, then uint8 tier codes, in one buffer."""
+    dtype = dtype_for(dtype)
+    n = len(prices)
+    out = bytearray(n * (dtype.itemsize + 1))
+    np.frombuffer(out, dtype=dtype, count=n)[:] = prices
+    np.frombuffer(out, dtype=np.uint8, offset=n * dtype.itemsize)[:] = codes
+    return out
+
+
+def encode_rows(X, dtype="float32"):
+    """Packed request body for an (n, 8) feature array."""
+    return np.ascontiguousarray(X, dtype=dtype_for(dtype)).tobytes()
+
+
+def decode_result(buffer, dtype="float32"):
+    """(prices, tier codes) views of a packed response body."""
+    dtype = dtype_for(dtype)
+    n = len(buffer) // (dtype.itemsize + 1)
+    return (np.frombuffer(buffer, dtype=dtype, count=n),
+            np.frombuffer(buffer, dtype=np.uint8, offset=n * dtype.itemsize))
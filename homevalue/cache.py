@@ -0,0 +1,100 @@
+"""Process-wide prediction cache keyed on quantized slider inputs.
+
+Every slider moves in fixed steps, so each input maps to an integer grid
+index per feature. The cache key is the model version plus those eight
+indices; entries for other versions are dropped as soon as a new version is
+seen. Inputs that can fall between grid points (the API's) are keyed on
+their exact values with ``row_key`` instead.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS
+
+_MIN = np.array([SLIDERS[name]["min_value"] for name in FEATURES], dtype=np.float64)
+_STEP = np.array([SLIDERS[name]["step"] for name in FEATURES], dtype=np.float64)
+
+
+def quantize(features):
+    """Slider grid index of each feature, as a hashable tuple."""
+    features = np.asarray(features, dtype=np.float64).reshape(len(FEATURES))
+    return tuple(np.rint((features - _MIN) / _STEP).astype(np.int64).tolist())
+
+
+def row_key(features):
+    """The exact float64 feature values, as bytes."""
+    return np.asarray(features, dtype=np.float64).reshape(len(FEATURES)).tobytes()
+
+
+class PredictionCache:
+    """Bounded LRU cache with a per-entry TTL. Safe to share across threads.
+
+    ``key`` maps a feature row to its cache key; rows with equal keys must
+    have equal predictions.
+    """
+
+    def __init__(self, maxsize=4096, ttl=3600.0, clock=time.monotonic, key=quantize):
+        self.maxsize = maxsize
+        self.key = key
+        self.ttl = ttl
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, version, features):
+        key = self.key(features)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, version, features, value):
+        key = self.key(features)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, version, features, compute):
+        """Cached value for features, calling compute() on a miss."""
+        value = self.get(version, features)
+        if value is None:
+            value = compute()
+            self.put(version, features, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "expirations": self.expirations,
+                    "invalidations": self.invalidations,
+                    "size": len(self._entries), "maxsize": self.maxsize,
+                    "version": self.version}
@@ -0,0 +1,135 @@
+"""Model compression: smaller forests and narrower storage.
+
+    python -m homevalue.compress report [--trees 25 50] [--depths 12 16]
+    python -m homevalue.compress publish --threshold-dtype float32 --value-bits 16 [--trees 50]
+
+``report`` evaluates a grid of operating points against the latest artifact
+and prints model size, load time and R²/RMSE next to the README baseline.
+``publish`` writes the chosen compression as a new artifact version.
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from homevalue.artifact import ARTIFACT_ROOT, export_forest, load_bundle, save_bundle
+from homevalue.forest import FlatForest
+
+# Accuracy quoted in the README for the original 100-tree forest.
+BASELINE_R2 = 0.81
+BASELINE_RMSE = 0.51
+
+STORAGE = {
+    "float64": dict(threshold_dtype=None, value_bits=None),
+    "float32": dict(threshold_dtype=np.float32, value_bits=None),
+    "float32+q16": dict(threshold_dtype=np.float32, value_bits=16),
+    "float16+q8": dict(threshold_dtype=np.float16, value_bits=8),
+}
+
+
+def apply_storage(forest, threshold_dtype=None, value_bits=None):
+    if threshold_dtype is None and not value_bits:
+        return forest
+    return forest.compress(threshold_dtype or np.float64, value_bits)
+
+
+def scores(forest, X_test, y_test):
+    y_pred = forest.predict(X_test)
+    residual = y_test - y_pred
+    rmse = float(np.sqrt(np.mean(residual ** 2)))
+    r2 = float(1 - np.sum(residual ** 2) / np.sum((y_test - y_test.mean()) ** 2))
+    return r2, rmse
+
+
+def load_seconds(forest, repeat=3):
+    """Best-of time to load the saved arrays fully into memory (no mmap)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        forest.save(tmp)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            FlatForest.load(tmp, mmap_mode=None)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def candidates(bundle, trees, depths):
+    """Yield (name, forest) operating points."""
+    full = bundle.forest
+    for n in [full.n_trees] + sorted(t for t in trees if t < full.n_trees):
+        pruned = full.prune(n)
+        for storage, options in STORAGE.items():
+            yield f"{n} trees, {storage}", apply_storage(pruned, **options)
+
+    if depths:
+        from homevalue.train import train_model
+        n_estimators = bundle.manifest["metadata"].get("params", {}).get(
+            "n_estimators", full.n_trees)
+        for depth in depths:
+            model, scaler, _ = train_model(n_estimators, params={"max_depth": depth})
+            forest = export_forest(model, scaler)
+            for storage in ("float64", "float32+q16"):
+                yield f"depth {depth}, {storage}", apply_storage(forest, **STORAGE[storage])
+
+
+def report(bundle, trees=(), depths=()):
+    from homevalue.train import split_data
+    _, X_test, _, y_test = split_data()
+    rows = []
+    for name, forest in candidates(bundle, trees, depths):
+        r2, rmse = scores(forest, X_test, y_test)
+        rows.append((name, forest.n_nodes, forest.nbytes / 1e6, load_seconds(forest) * 1e3,
+                     r2, rmse))
+    print(f"{'operating point':<24} {'nodes':>10} {'MB':>8} {'load ms':>8} "
+          f"{'R²':>7} {'ΔR²':>7} {'RMSE':>7} {'ΔRMSE':>7}")
+    for name, nodes, mb, load_ms, r2, rmse in rows:
+        print(f"{name:<24} {nodes:>10,} {mb:>8.1f} {load_ms:>8.1f} {r2:>7.3f} "
+              f"{r2 - BASELINE_R2:>+7.3f} {rmse:>7.3f} {rmse - BASELINE_RMSE:>+7.3f}")
+    return rows
+
+
+def publish(bundle, trees=None, threshold_dtype=None, value_bits=None, root=ARTIFACT_ROOT):
+    from homevalue.train import split_data
+    forest = bundle.forest.prune(trees) if trees else bundle.forest
+    forest = apply_storage(forest, threshold_dtype, value_bits)
+    _, X_test, _, y_test = split_data()
+    r2, rmse = scores(forest, X_test, y_test)
+    metadata = dict(bundle.manifest.get("metadata", {}), r2=r2, rmse=rmse,
+                    compressed_from=bundle.version,
+                    compression={"trees": forest.n_trees,
+                                 "threshold_dtype": str(forest.threshold.dtype),
+                                 "value_bits": value_bits})
+    version = save_bundle(bundle.model, bundle.scaler, metadata, root=root, forest=forest)
+    print(f"Published {version} ({forest.nbytes / 1e6:.1f} MB forest, "
+          f"R² {r2:.3f}, RMSE {rmse:.3f})")
+    return version
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress the forest and compare.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rep = commands.add_parser("report", help="compare operating points")
+    rep.add_argument("--trees", type=int, nargs="*", default=[25, 50],
+                     help="also evaluate the first N trees only")
+    rep.add_argument("--depths", type=int, nargs="*", default=[],
+                     help="also retrain with these max_depth limits (slow)")
+    pub = commands.add_parser("publish", help="publish a compressed artifact")
+    pub.add_argument("--trees", type=int, help="keep only the first N trees")
+    pub.add_argument("--threshold-dtype", choices=["float32", "float16"])
+    pub.add_argument("--value-bits", type=int, choices=[8, 16])
+    for sub in (rep, pub):
+        sub.add_argument("--root", default=str(ARTIFACT_ROOT), help="artifact root directory")
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle(args.root)
+    if bundle.forest is None:
+        raise SystemExit(f"Artifact {bundle.version} has no flat forest to compress")
+    if args.command == "report":
+        report(bundle, args.trees, args.depths)
+    else:
+        publish(bundle, args.trees, args.threshold_dtype, args.value_bits, args.root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Local, offline copy of the California housing dataset.
+
+    python -m homevalue.dataset import              # fetch via sklearn (needs network)
+    python -m homevalue.dataset import --csv housing.csv
+    python -m homevalue.dataset verify
+
+The data is stored as raw ``.npy`` arrays plus a manifest with checksums, so
+later loads memory-map it without parsing or copying. Copy the directory to
+machines without outbound network access.
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from homevalue import FEATURES
+from homevalue.artifact import sha256_file
+
+DATA_DIR = Path(os.environ.get(
+    "HOMEVALUE_DATA_DIR",
+    Path(__file__).resolve().parent.parent / "data" / "california_housing"))
+MANIFEST_FILE = "manifest.json"
+TARGET = "MedHouseVal"
+TARGET_ALIASES = (TARGET, "Price")
+
+
+class DatasetError(Exception):
+    pass
+
+
+class DatasetMissingError(DatasetError):
+    pass
+
+
+def _fetch():
+    from sklearn.datasets import fetch_california_housing
+    housing = fetch_california_housing()
+    return housing.data, housing.target, "sklearn.datasets.fetch_california_housing"
+
+
+def _read_csv(path):
+    import pandas as pd
+    frame = pd.read_csv(path)
+    target = next((name for name in TARGET_ALIASES if name in frame.columns), None)
+    missing = [name for name in FEATURES if name not in frame.columns]
+    if missing or target is None:
+        raise DatasetError(f"{path} needs columns {', '.join(FEATURES)} and one of "
+                           f"{', '.join(TARGET_ALIASES)}")
+    return frame[FEATURES].to_numpy(np.float64), frame[target].to_numpy(np.float64), str(path)
+
+
+def import_dataset(csv=None, data_dir=DATA_DIR):
+    """Write the dataset to data_dir. Returns the manifest."""
+    X, y, source = _read_csv(csv) if csv else _fetch()
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    np.save(data_dir / "X.npy", np.ascontiguousarray(X, dtype=np.float64))
+    np.save(data_dir / "y.npy", np.ascontiguousarray(y, dtype=np.float64))
+    manifest = {
+        "features": FEATURES,
+        "target": TARGET,
+        "n_rows": int(len(X)),
+        "source": source,
+        "imported_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "files": {name: sha256_file(data_dir / name) for name in ("X.npy", "y.npy")},
+    }
+    (data_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _manifest(data_dir):
+    try:
+        return json.loads((Path(data_dir) / MANIFEST_FILE).read_text())
+    except FileNotFoundError:
+        raise DatasetMissingError(
+            f"No local copy of the housing data in {data_dir}. Run "
+            "`python -m homevalue.dataset import` on a machine with network access "
+            "(or pass --csv) and copy that directory here, or set HOMEVALUE_DATA_DIR.")
+
+
+def verify_dataset(data_dir=DATA_DIR):
+    manifest = _manifest(data_dir)
+    for name, expected in manifest["files"].items():
+        if sha256_file(Path(data_dir) / name) != expected:
+            raise DatasetError(f"Checksum mismatch for {Path(data_dir) / name}; "
+                               "re-run `python -m homevalue.dataset import`")
+    return manifest
+
+
+def load_dataset(data_dir=DATA_DIR, mmap=True, verify=True):
+    """(X, y) from the local copy, memory-mapped read-only by default."""
+    manifest = verify_dataset(data_dir) if verify else _manifest(data_dir)
+    if manifest["features"] != FEATURES:
+        raise DatasetError(f"{data_dir} has a different feature order than the model")
+    mode = "r" if mmap else None
+    return (np.load(Path(data_dir) / "X.npy", mmap_mode=mode),
+            np.load(Path(data_dir) / "y.npy", mmap_mode=mode))
+
+
+def load_or_import(data_dir=DATA_DIR):
+    """Local copy if present, otherwise fetch once and store it."""
+    try:
+        return load_dataset(data_dir)
+    except DatasetMissingError as missing:
+        try:
+            import_dataset(data_dir=data_dir)
+        except OSError as exc:
+            raise DatasetMissingError(f"{missing} (fetching failed: {exc})") from exc
+        return load_dataset(data_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local housing dataset.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imp = commands.add_parser("import", help="fetch or read the data and store it locally")
+    imp.add_argument("--csv", help="import from a CSV instead of fetching")
+    imp.add_argument("--data-dir", default=str(DATA_DIR))
+    ver = commands.add_parser("verify", help="check the local copy against its checksums")
+    ver.add_argument("--data-dir", default=str(DATA_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        manifest = import_dataset(args.csv, args.data_dir)
+        print(f"Imported {manifest['n_rows']:,} rows from {manifest['source']} "
+              f"into {args.data_dir}")
+    else:
+        try:
+            manifest = verify_dataset(args.data_dir)
+        except DatasetError as exc:
+            raise SystemExit(str(exc))
+        print(f"{args.data_dir}: {manifest['n_rows']:,} rows, checksums OK")
+
+
+if __name__ == "__main__":
+    main()
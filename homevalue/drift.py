@@ -0,0 +1,146 @@
+"""Streaming input-drift monitor.
+
+Training stores a per-feature profile: decile bin edges and the share of
+training rows in each bin. At serving time ``observe`` only copies rows into a
+preallocated buffer of ``buffer_size`` rows; a background thread periodically
+bins the buffered rows into exponentially decayed per-feature histograms and
+scores each feature with the population stability index (PSI) against the
+profile. Memory stays constant whatever the request sizes: rows that do not
+fit before the next update are counted as dropped.
+"""
+import logging
+import threading
+
+import numpy as np
+
+from homevalue import FEATURES
+
+log = logging.getLogger(__name__)
+
+N_BINS = 10
+# Conventional PSI reading: < 0.1 stable, 0.1-0.25 moderate, > 0.25 major shift.
+PSI_ALERT = 0.25
+# PSI over a handful of rows is noise; score only once the decayed histogram
+# holds at least this much weight.
+MIN_ROWS = 500
+_EPS = 1e-4
+
+
+def feature_profile(X, n_bins=N_BINS):
+    """Per-feature quantile bin edges and training proportions (JSON-friendly)."""
+    X = np.asarray(X, dtype=np.float64)
+    profile = {}
+    for j, name in enumerate(FEATURES):
+        edges = np.unique(np.quantile(X[:, j], np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, X[:, j], side="right"),
+                             minlength=len(edges) + 1)
+        profile[name] = {"edges": edges.tolist(), "proportions": (counts / len(X)).tolist()}
+    return profile
+
+
+def psi(expected, actual):
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), _EPS)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), _EPS)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class DriftMonitor:
+
+    def __init__(self, profile, interval=60.0, half_life=10_000, buffer_size=65_536,
+                 alert=PSI_ALERT, min_rows=MIN_ROWS):
+        self.edges = [np.asarray(profile[name]["edges"]) for name in FEATURES]
+        self.expected = [np.asarray(profile[name]["proportions"]) for name in FEATURES]
+        self.counts = [np.zeros(len(e)) for e in self.expected]
+        # Per-row decay so that a row's weight halves after `half_life` newer rows.
+        self.decay = 0.5 ** (1 / half_life)
+        self.alert = alert
+        self.min_rows = min_rows
+        self.observed = 0
+        self.dropped = 0
+        self.scores = {}
+        self._rows = np.empty((buffer_size, len(FEATURES)))
+        self._filled = 0
+        self._buffer_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._loop, args=(interval,),
+                                            name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def observe(self, X):
+        """Record incoming feature rows; binning happens later.
+
+        Copies at most the buffer's free space. A request larger than that
+        contributes an evenly spaced sample of its rows.
+        """
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        with self._buffer_lock:
+            free = len(self._rows) - self._filled
+            if len(X) > free:
+                self.dropped += len(X) - free
+                X = X[np.linspace(0, len(X) - 1, free).astype(np.intp)]
+            self._rows[self._filled:self._filled + len(X)] = X
+            self._filled += len(X)
+
+    def _drain(self):
+        with self._buffer_lock:
+            X = self._rows[:self._filled].copy()
+            self._filled = 0
+        if not len(X):
+            return 0
+        weight = self.decay ** len(X)
+        # Newer rows weigh more: row i of n gets decay ** (n - 1 - i).
+        row_weights = self.decay ** np.arange(len(X) - 1, -1, -1)
+        for j in range(len(FEATURES)):
+            bins = np.searchsorted(self.edges[j], X[:, j], side="right")
+            self.counts[j] = self.counts[j] * weight + np.bincount(
+                bins, weights=row_weights, minlength=len(self.counts[j]))
+        self.observed += len(X)
+        return len(X)
+
+    def update(self):
+        """Bin buffered rows and recompute scores. Returns {feature: psi}."""
+        with self._lock:
+            self._drain()
+            scores = {}
+            for name, counts, expected in zip(FEATURES, self.counts, self.expected):
+                total = counts.sum()
+                if total >= self.min_rows:
+                    scores[name] = psi(expected, counts / total)
+            self.scores = scores
+        drifted = {k: round(v, 3) for k, v in scores.items() if v > self.alert}
+        if drifted:
+            log.warning("Input drift above PSI %.2f: %s", self.alert, drifted)
+        return scores
+
+    def _loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.update()
+            except Exception:
+                log.exception("Drift update failed")
+
+    def stats(self):
+        return {"observed": self.observed, "dropped": self.dropped,
+                "psi": dict(self.scores), "alert": self.alert}
+
+    def collector(self):
+        """Metrics collector exporting the latest PSI per feature."""
+        def collect():
+            for name, value in self.scores.items():
+                yield (f'homevalue_drift_psi{{feature="{name}"}}', "gauge",
+                       "Population stability index of live inputs vs training.", value)
+        return collect
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def monitor_for(bundle, **kwargs):
+    """DriftMonitor for a bundle's training profile, or None if it has none."""
+    profile = bundle.manifest.get("metadata", {}).get("feature_profile")
+    return DriftMonitor(profile, **kwargs) if profile else None
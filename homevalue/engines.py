@@ -0,0 +1,210 @@
+"""Model engines: the estimator families training and serving can use.
+
+    python -m homevalue.train --engine hgb
+    python -m homevalue.engines [--engines forest hgb] [--n-estimators 100]
+
+An engine builds an unfitted scikit-learn regressor from the shared training
+knobs (number of trees or boosting iterations, random_state, cores), grows a
+fitted one with warm start, and readies it for serving. Every engine is fitted
+and scored by ``train_model`` on the same ``random_state=42`` split and is
+published in the same (model, scaler) artifact format.
+
+``forest`` (RandomForestRegressor) is the default and is served from the
+flat-array forest. ``hgb`` (HistGradientBoostingRegressor) is served through
+scikit-learn's compiled predictor, so its artifacts load joblib and sklearn
+at startup and have no prediction intervals or explanations.
+
+Running the module prints a comparison of the engines: accuracy, training
+time, artifact size and serving latency (one row and a full batch), measured
+through the published artifact exactly as the app and API would load it.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# Extra estimator arguments the train CLI exposes, shared by both engines.
+TREE_PARAMS = ("max_depth", "max_leaf_nodes", "min_samples_leaf")
+
+
+class Engine(ABC):
+    """How to fit, grow and finalize one family of models."""
+
+    name = None
+    algorithm = None
+    params = TREE_PARAMS
+
+    def check_params(self, params):
+        unknown = sorted(set(params) - set(self.params))
+        if unknown:
+            raise ValueError(f"The {self.name} engine does not take {', '.join(unknown)}")
+
+    @abstractmethod
+    def build(self, n_estimators, random_state, n_jobs, params):
+        """Unfitted estimator."""
+
+    @abstractmethod
+    def n_fitted(self, model):
+        """Trees or iterations already in a fitted model."""
+
+    def grow(self, model, n_estimators, random_state, n_jobs):
+        """Set up a fitted model to add trees on its next ``fit``."""
+        if type(model).__name__ != self.algorithm:
+            raise ValueError(f"Cannot grow a {type(model).__name__} with the "
+                             f"{self.name} engine")
+        if model.random_state != random_state:
+            raise ValueError(f"Cannot grow a model trained with random_state="
+                             f"{model.random_state} using random_state={random_state}")
+        if n_estimators <= self.n_fitted(model):
+            raise ValueError(f"Model already has {self.n_fitted(model)} trees; "
+                             f"n_estimators must be larger to grow it")
+        self._warm_start(model, n_estimators, n_jobs)
+
+    @abstractmethod
+    def _warm_start(self, model, n_estimators, n_jobs):
+        """Set warm start and the larger size on a fitted model."""
+
+    def finish(self, model):
+        """Ready a fitted model for serving."""
+        model.set_params(warm_start=False)
+
+
+class ForestEngine(Engine):
+    name = "forest"
+    algorithm = "RandomForestRegressor"
+
+    def build(self, n_estimators, random_state, n_jobs, params):
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_estimators=n_estimators, random_state=random_state,
+                                     n_jobs=n_jobs, **params)
+
+    def n_fitted(self, model):
+        return len(model.estimators_)
+
+    def _warm_start(self, model, n_estimators, n_jobs):
+        model.set_params(warm_start=True, n_estimators=n_estimators, n_jobs=n_jobs)
+
+    def finish(self, model):
+        # Serve single-threaded: per-call thread dispatch dominates small
+        # requests, and a fixed accumulation order keeps results bit-exact.
+        model.set_params(warm_start=False, n_jobs=None)
+
+
+class HistGradientBoostingEngine(Engine):
+    """Histogram gradient boosting; ``n_estimators`` is the number of iterations.
+
+    Early stopping is off so that every iteration is kept and the fit does not
+    carve its own validation set out of the shared training split. Fitting
+    threads are OpenMP's, so ``n_jobs`` does not apply.
+    """
+
+    name = "hgb"
+    algorithm = "HistGradientBoostingRegressor"
+    params = TREE_PARAMS + ("learning_rate",)
+
+    def build(self, n_estimators, random_state, n_jobs, params):
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        return HistGradientBoostingRegressor(max_iter=n_estimators, random_state=random_state,
+                                             early_stopping=False, **params)
+
+    def n_fitted(self, model):
+        return model.n_iter_
+
+    def _warm_start(self, model, n_estimators, n_jobs):
+        model.set_params(warm_start=True, max_iter=n_estimators)
+
+
+ENGINES = {engine.name: engine for engine in (ForestEngine(), HistGradientBoostingEngine())}
+DEFAULT_ENGINE = "forest"
+
+
+def get_engine(name):
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine {name!r}; choose from {', '.join(ENGINES)}")
+
+
+def artifact_engine(manifest):
+    """Engine name recorded in a manifest (artifacts before engines were forests)."""
+    return manifest.get("metadata", {}).get("engine", DEFAULT_ENGINE)
+
+
+def _directory_bytes(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def single_row_ms(bundle, X, n=200):
+    """Median latency of one-row ``predict`` calls over the first ``n`` rows."""
+    rows = X[:n]
+    for row in rows[:20]:
+        bundle.predict(row)
+    times = []
+    for row in rows:
+        start = time.perf_counter()
+        bundle.predict(row)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def batch_seconds(bundle, X, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bundle.predict(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def evaluate(name, n_estimators, params=None):
+    """Train, publish to a scratch root and time one engine. Returns a result dict."""
+    from homevalue.artifact import load_bundle, save_bundle
+    from homevalue.train import split_data, train_model
+
+    model, scaler, metadata = train_model(n_estimators, params=params, engine=name)
+    X_test = split_data()[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        version = save_bundle(model, scaler, metadata, root=tmp)
+        size = _directory_bytes(Path(tmp) / version)
+        bundle = load_bundle(tmp, version)
+        single = single_row_ms(bundle, X_test)
+        batch = batch_seconds(bundle, X_test)
+    return {"engine": name, "r2": metadata["r2"], "rmse": metadata["rmse"],
+            "fit_seconds": metadata["timings"]["fit"], "mb": size / 1e6,
+            "single_ms": single, "batch_rows": len(X_test),
+            "batch_rows_per_second": len(X_test) / batch}
+
+
+def report(names=tuple(ENGINES), n_estimators=None, params=None):
+    from homevalue.train import N_ESTIMATORS, RANDOM_STATE
+    n_estimators = n_estimators or N_ESTIMATORS
+    rows = [evaluate(name, n_estimators, params) for name in names]
+    print(f"{n_estimators} trees/iterations, random_state={RANDOM_STATE} split, "
+          f"batch of {rows[0]['batch_rows']:,} rows")
+    print(f"{'engine':<8} {'R²':>6} {'RMSE':>6} {'fit s':>7} {'MB':>7} "
+          f"{'1-row ms':>9} {'batch rows/s':>13}")
+    for row in rows:
+        print(f"{row['engine']:<8} {row['r2']:>6.3f} {row['rmse']:>6.3f} "
+              f"{row['fit_seconds']:>7.2f} {row['mb']:>7.1f} {row['single_ms']:>9.3f} "
+              f"{row['batch_rows_per_second']:>13,.0f}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare model engines by accuracy and cost.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--n-estimators", type=int,
+                        help="trees (forest) or boosting iterations (hgb)")
+    parser.add_argument("--max-depth", type=int)
+    parser.add_argument("--max-leaf-nodes", type=int)
+    parser.add_argument("--min-samples-leaf", type=int)
+    args = parser.parse_args(argv)
+    report(args.engines, args.n_estimators,
+           {"max_depth": args.max_depth, "max_leaf_nodes": args.max_leaf_nodes,
+            "min_samples_leaf": args.min_samples_leaf})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Flat-array inference engine for fitted random forests.
+
+All trees are concatenated into a handful of contiguous arrays (one entry per
+node) and evaluated level by level for every tree and row at once, so a
+prediction costs at most ``max_depth`` vectorized NumPy steps instead of
+sklearn's per-call validation and per-estimator dispatch.
+
+Results are bit-for-bit identical to ``RandomForestRegressor.predict``: inputs
+are compared in float32 like sklearn's tree code, and per-tree outputs are
+summed in estimator order before dividing by the number of trees.
+
+A forest trained on ``StandardScaler`` output can have the scaler folded into
+its thresholds (``fold_scaler``). The folded forest takes raw float64 feature
+values and makes exactly the same split decisions as scaler + float32 cast.
+
+``contributions`` splits each prediction into a bias plus one term per
+feature (tree-path attribution): every split on a row's path credits the
+change in node mean it causes to the feature it splits on.
+
+``compress`` and ``prune`` trade accuracy for memory (narrower thresholds,
+quantized leaf values, fewer trees); the result is marked ``exact=False``.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+META_FILE = "meta.json"
+BLOCK_ROWS = 4096
+_SIGN = np.int64(-0x8000000000000000)
+
+
+class FlatForest:
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 folded=False, exact=True, value_scale=None, value_offset=0.0):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        # Folded forests compare raw float64 inputs; unfolded ones compare
+        # scaled inputs in float32, exactly as sklearn does.
+        self.folded = bool(folded)
+        self.input_dtype = np.float64 if self.folded else np.float32
+        # False once compression or pruning means results differ from sklearn.
+        self.exact = bool(exact)
+        # Quantized leaves store integer codes: value = offset + code * scale.
+        self.value_scale = value_scale
+        self.value_offset = value_offset
+        self._delta = None
+
+    def _replace(self, **changes):
+        fields = {name: getattr(self, name) for name in ARRAYS}
+        fields.update(max_depth=self.max_depth, folded=self.folded, exact=self.exact,
+                      value_scale=self.value_scale, value_offset=self.value_offset)
+        fields.update(changes)
+        return FlatForest(**fields)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Export a fitted single-output RandomForestRegressor."""
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("FlatForest only supports single-output forests")
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            own = np.arange(offset, offset + n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            # Leaves point at themselves, so extra levels are no-ops.
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(np.concatenate(features), np.concatenate(thresholds),
+                   np.concatenate(lefts), np.concatenate(rights),
+                   np.concatenate(values), np.asarray(roots, dtype=np.int32),
+                   max_depth)
+
+    def fold_scaler(self, scaler):
+        """Copy of this forest that takes raw inputs instead of scaled ones."""
+        if self.folded:
+            raise ValueError("Forest already has a scaler folded in")
+        n_features = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+        threshold = self.threshold.copy()
+        split = np.isfinite(threshold)
+        threshold[split] = fold_thresholds(threshold[split], mean[self.feature[split]],
+                                           scale[self.feature[split]])
+        return self._replace(threshold=threshold, folded=True)
+
+    def compress(self, threshold_dtype=np.float32, value_bits=None):
+        """Copy with narrower thresholds and optionally quantized leaf values."""
+        threshold_dtype = np.dtype(threshold_dtype)
+        split = np.isfinite(self.threshold)
+        if np.abs(self.threshold[split]).max(initial=0) > np.finfo(threshold_dtype).max:
+            raise ValueError(f"Thresholds overflow {threshold_dtype}")
+        changes = {
+            "feature": self.feature.astype(np.uint8),
+            "threshold": self.threshold.astype(threshold_dtype),
+            "exact": False,
+        }
+        if value_bits:
+            if self.value_scale is not None:
+                raise ValueError("Leaf values are already quantized")
+            codes_dtype = {8: np.uint8, 16: np.uint16}[value_bits]
+            lo, hi = float(self.value.min()), float(self.value.max())
+            scale = (hi - lo) / (2 ** value_bits - 1) or 1.0
+            changes.update(value=np.rint((self.value - lo) / scale).astype(codes_dtype),
+                           value_scale=scale, value_offset=lo)
+        else:
+            changes["value"] = self.value.astype(threshold_dtype)
+        return self._replace(**changes)
+
+    def prune(self, n_trees):
+        """Copy keeping only the first n_trees trees."""
+        if not 0 < n_trees <= self.n_trees:
+            raise ValueError(f"n_trees must be in 1..{self.n_trees}")
+        if n_trees == self.n_trees:
+            return self
+        end = int(self.roots[n_trees])
+        return self._replace(feature=self.feature[:end], threshold=self.threshold[:end],
+                             left=self.left[:end], right=self.right[:end],
+                             value=self.value[:end], roots=self.roots[:n_trees],
+                             exact=False)
+
+    def leaf_values(self, X):
+        """Per-tree outputs, shape (n_trees, n_rows)."""
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        # One slot per (tree, row) pair; only pairs still above a leaf are
+        # carried into the next level.
+        leaf = np.repeat(self.roots, n_rows)
+        slots = np.arange(leaf.size)
+        node = leaf.copy()
+        offset = np.tile(np.arange(n_rows) * n_features, self.n_trees)
+        for _ in range(self.max_depth):
+            go_left = flat_X[offset + self.feature[node]] <= self.threshold[node]
+            child = np.where(go_left, self.left[node], self.right[node])
+            leaf[slots] = child
+            moved = child != node
+            if moved.all():
+                node = child
+                continue
+            slots, node, offset = slots[moved], child[moved], offset[moved]
+            if not slots.size:
+                break
+        values = self.value[leaf].reshape(self.n_trees, n_rows)
+        if self.value_scale is not None:
+            return self.value_offset + values * self.value_scale
+        return values.astype(np.float64, copy=False)
+
+    def node_values(self):
+        """Mean target of every node as float64 (dequantized if needed)."""
+        if self.value_scale is not None:
+            return self.value_offset + self.value * self.value_scale
+        return self.value.astype(np.float64, copy=False)
+
+    def node_deltas(self):
+        """Per-node change in mean from its parent (0 at roots), built once."""
+        if self._delta is None:
+            values = self.node_values()
+            delta = np.zeros(self.n_nodes)
+            own = np.arange(self.n_nodes)
+            for children in (self.left, self.right):
+                split = children != own
+                delta[children[split]] = values[children[split]] - values[split]
+            self._delta = delta
+        return self._delta
+
+    def contributions(self, X, block_rows=BLOCK_ROWS):
+        """Tree-path feature attributions averaged over the forest.
+
+        Returns ``(bias, contributions)`` where ``bias`` is the mean root value
+        and ``contributions`` has shape (n_rows, n_features);
+        ``bias + contributions.sum(axis=1)`` equals ``predict(X)`` up to
+        float rounding.
+        """
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        delta = self.node_deltas()
+        out = np.empty((n_rows, n_features))
+        for start in range(0, n_rows, block_rows):
+            block = X[start:start + block_rows]
+            flat_X = block.ravel()
+            size = len(block) * n_features
+            total = np.zeros(size)
+            node = np.repeat(self.roots, len(block))
+            # offset + feature is both the input to compare and the output cell
+            # (row, feature) that the split's delta is credited to.
+            offset = np.tile(np.arange(len(block)) * n_features, self.n_trees)
+            for _ in range(self.max_depth):
+                cell = offset + self.feature[node]
+                go_left = flat_X[cell] <= self.threshold[node]
+                child = np.where(go_left, self.left[node], self.right[node])
+                moved = child != node
+                if not moved.all():
+                    cell, child, offset = cell[moved], child[moved], offset[moved]
+                if not child.size:
+                    break
+                total += np.bincount(cell, weights=delta[child], minlength=size)
+                node = child
+            out[start:start + len(block)] = total.reshape(len(block), n_features)
+        bias = float(self.node_values()[self.roots].mean())
+        return bias, out / self.n_trees
+
+    def predict(self, X, block_rows=BLOCK_ROWS):
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            values = self.leaf_values(X[start:start + block_rows])
+            # cumsum adds strictly left to right, matching sklearn's accumulation.
+            out[start:start + block_rows] = np.cumsum(values, axis=0)[-1] / self.n_trees
+        return out
+
+    def predict_interval(self, X, quantiles=(0.05, 0.95), block_rows=BLOCK_ROWS):
+        """Mean prediction and per-tree quantiles from one pass over all trees.
+
+        Returns ``(mean, bounds)`` with ``bounds`` of shape (len(quantiles), n_rows);
+        ``mean`` is identical to ``predict``.
+        """
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        mean = np.empty(len(X), dtype=np.float64)
+        bounds = np.empty((len(quantiles), len(X)), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            block = slice(start, start + block_rows)
+            values = self.leaf_values(X[block])
+            mean[block] = np.cumsum(values, axis=0)[-1] / self.n_trees
+            bounds[:, block] = np.quantile(values, quantiles, axis=0)
+        return mean, bounds
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        meta = {"max_depth": self.max_depth, "folded": self.folded, "exact": self.exact,
+                "value_scale": self.value_scale, "value_offset": self.value_offset}
+        (directory / META_FILE).write_text(json.dumps(meta))
+        return [f"{name}.npy" for name in ARRAYS] + [META_FILE]
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        directory = Path(directory)
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+                  for name in ARRAYS}
+        meta = json.loads((directory / META_FILE).read_text())
+        return cls(**meta, **arrays)
+
+
+def _scaled(x, mean, scale):
+    # StandardScaler.transform in float64, then the tree's float32 cast.
+    return ((x - mean) / scale).astype(np.float32)
+
+
+def _to_key(x):
+    """Map float64 to int64 so that key order equals numeric order."""
+    bits = x.view(np.int64)
+    return np.where(bits < 0, _SIGN - bits, bits)
+
+
+def _from_key(key):
+    return np.where(key < 0, _SIGN - key, key).view(np.float64)
+
+
+def fold_thresholds(threshold, mean, scale):
+    """Largest raw x per split such that float32((x - mean) / scale) <= threshold.
+
+    The scaled value is monotone in x, so ``x <= result`` reproduces the split
+    decision of the scaled path for every float64 input. The boundary is found
+    by bisection over the ordered bit patterns of float64.
+    """
+    with np.errstate(over="ignore"):
+        guess = threshold * scale + mean
+        delta = (np.abs(threshold) + 1.0) * scale * 1e-6
+        lo, hi = guess - delta, guess + delta
+        # Widen until the bracket surely contains the boundary.
+        while True:
+            bad_lo = _scaled(lo, mean, scale) > threshold
+            bad_hi = _scaled(hi, mean, scale) <= threshold
+            if not (bad_lo.any() or bad_hi.any()):
+                break
+            delta = delta * 2
+            lo = np.where(bad_lo, guess - delta, lo)
+            hi = np.where(bad_hi, guess + delta, hi)
+        lo_key, hi_key = _to_key(lo), _to_key(hi)
+        while True:
+            open_ = hi_key - lo_key > 1
+            if not open_.any():
+                break
+            mid_key = lo_key + (hi_key - lo_key) // 2
+            ok = _scaled(_from_key(mid_key), mean, scale) <= threshold
+            lo_key = np.where(open_ & ok, mid_key, lo_key)
+            hi_key = np.where(open_ & ~ok, mid_key, hi_key)
+    return _from_key(lo_key)
@@ -0,0 +1,201 @@
+"""Vectorized text formatting for prices and other result fields.
+
+    usd([243975.6, 1e6])                    -> ['$243,976', '$1,000,000']
+    fixed(34.05, 1, suffix="°N")            -> '34.0°N'
+    template((lat, 1, False), "°N, ", (lon, 1, False), "°W")
+
+Results are identical to Python's ``format(value, ",.Nf")`` with the same
+literal text around it, including round-half-even rounding of the exact
+binary value. Scalars give a ``str``, arrays a NumPy ``U`` string array.
+
+Small inputs are formatted with Python directly. Larger ones are grouped by
+layout (digit count and sign of every field), which fixes the position of
+every character within a group; each group's characters are then written
+column by column as UCS-4 code points into a (rows, width) array that is
+viewed as ``U`` strings. NumPy pads ``U`` strings with trailing NULs, so rows
+shorter than the widest need no stripping.
+"""
+import itertools
+
+import numpy as np
+
+# Below this many rows per-row Python formatting is faster; both paths give
+# identical strings.
+VECTOR_MIN_ROWS = 192
+
+_ZERO = ord("0")
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+# Veltkamp splitter for exact float64 products.
+_SPLIT = 134217729.0
+
+
+def _split(a):
+    t = _SPLIT * a
+    high = t - (t - a)
+    return high, a - high
+
+
+def _scaled_integers(values, decimals):
+    """|values| * 10**decimals rounded half-even on the exact product, as int64."""
+    factor = float(_POW10[decimals])
+    product = values * factor
+    if decimals:
+        # Dekker's two-product: product + error is exactly values * factor, so
+        # a product that landed on .5 by rounding can be pushed off the tie.
+        a_high, a_low = _split(values)
+        f_high, f_low = _split(factor)
+        error = ((a_high * f_high - product) + a_high * f_low + a_low * f_high) \
+            + a_low * f_low
+        floor = np.floor(product)
+        tie = product - floor == 0.5
+        product = np.where(tie & (error > 0), floor + 1, np.where(tie & (error < 0), floor,
+                                                                  product))
+    return np.rint(np.abs(product)).astype(np.int64)
+
+
+def _layout(digits, negative, decimals, grouping):
+    """Characters of one field: str literals and powers of ten (digit positions)."""
+    items = ["-"] if negative else []
+    int_digits = digits - decimals
+    for k in range(int_digits - 1, -1, -1):
+        items.append(k + decimals)
+        if grouping and k and k % 3 == 0:
+            items.append(",")
+    if decimals:
+        items.append(".")
+        items.extend(range(decimals - 1, -1, -1))
+    return items
+
+
+def _limit(decimals):
+    # Scaled values must stay exact integers in float64.
+    return 2.0 ** 53 / 10 ** decimals
+
+
+def _out_of_range(decimals):
+    return ValueError(f"Values must be finite and below {_limit(decimals):g} in "
+                      "magnitude to format exactly")
+
+
+def _python(pieces):
+    columns = []
+    for piece in pieces:
+        if isinstance(piece, str):
+            columns.append(itertools.repeat(piece))
+            continue
+        values, decimals, grouping = piece
+        values = values.tolist()
+        limit = _limit(decimals)
+        # NaN fails the comparison too.
+        if not all(abs(v) < limit for v in values):
+            raise _out_of_range(decimals)
+        spec = f"{',' if grouping else ''}.{decimals}f"
+        columns.append([format(v, spec) for v in values])
+    return np.array(["".join(parts) for parts in zip(*columns)], dtype=str)
+
+
+def template(*pieces):
+    """Row-wise concatenation of literal strings and formatted fields.
+
+    A field is ``(values, decimals, grouping)``: every value formatted like
+    ``f"{value:,.{decimals}f}"`` (the comma only with ``grouping``). All
+    fields broadcast to one shape; at least one is required.
+    """
+    arrays = [np.asarray(piece[0], dtype=np.float64)
+              for piece in pieces if not isinstance(piece, str)]
+    if len(arrays) > 1:
+        arrays = np.broadcast_arrays(*arrays)
+    shape, n = arrays[0].shape, arrays[0].size
+    it = iter(arrays)
+    pieces = [piece if isinstance(piece, str) else (next(it).ravel(), *piece[1:])
+              for piece in pieces]
+    if n < VECTOR_MIN_ROWS:
+        strings = _python(pieces)
+    else:
+        strings = _vectorized(pieces, n)
+    return str(strings[0]) if not shape else strings.reshape(shape)
+
+
+def _vectorized(pieces, n):
+    # Per field: scaled integers, digit count (at least one integer digit)
+    # and sign; the combination of counts and signs is the row's layout.
+    fields, key, base = [], np.zeros(n, dtype=np.int64), 1
+    for piece in pieces:
+        if isinstance(piece, str):
+            continue
+        values, decimals, grouping = piece
+        if not (np.abs(values) < _limit(decimals)).all():
+            raise _out_of_range(decimals)
+        scaled = _scaled_integers(values, decimals)
+        digits = np.maximum(np.searchsorted(_POW10, scaled, side="right"), decimals + 1)
+        negative = np.signbit(values)
+        fields.append((scaled, digits, negative, decimals, grouping))
+        key += (digits * 2 + negative) * base
+        base *= 2 * len(_POW10) + 2
+    # A stable sort of keys that fit 16 bits is a radix sort: linear in n.
+    order = np.argsort(key.astype(np.uint16) if base <= 1 << 16 else key, kind="stable")
+    starts = np.flatnonzero(np.diff(key[order], prepend=-1))
+
+    groups = []
+    for start, end in zip(starts, list(starts[1:]) + [n]):
+        rows = order[start:end]
+        first = rows[0]
+        layout, it = [], iter(fields)
+        for piece in pieces:
+            if isinstance(piece, str):
+                layout.append([(None, piece)])
+            else:
+                scaled, digits, negative, decimals, grouping = next(it)
+                field = _layout(int(digits[first]), bool(negative[first]), decimals, grouping)
+                layout.append([(scaled, item) for item in field])
+        groups.append((rows, [cell for part in layout for cell in part]))
+    width = max(sum(len(text) if isinstance(text, str) else 1 for _, text in cells)
+                for _, cells in groups)
+
+    out = np.empty((n, width), dtype=np.uint32)
+    for rows, cells in groups:
+        # Column-major, so that every column is one contiguous write.
+        block = np.zeros((width, len(rows)), dtype=np.uint32)
+        digits = {}
+        column = 0
+        for scaled, item in cells:
+            if isinstance(item, str):
+                for char in item:
+                    block[column] = ord(char)
+                    column += 1
+                continue
+            if id(scaled) not in digits:
+                count = max(item for s, item in cells if s is scaled and isinstance(item, int))
+                digits[id(scaled)] = _digits(scaled[rows], count + 1)
+            np.add(digits[id(scaled)][item], _ZERO, out=block[column])
+            column += 1
+        out[rows] = block.T
+    return out.view(f"<U{width}")[:, 0]
+
+
+def _digits(scaled, count):
+    """The lowest ``count`` decimal digits of non-negative integers: (count, n)."""
+    # 32-bit division is several times faster; most values fit.
+    dtype = np.uint32 if scaled.max(initial=0) < 1 << 32 else np.uint64
+    q = scaled.astype(dtype)
+    ten = dtype(10)
+    out = np.empty((count, len(q)), dtype=np.uint32)
+    for k in range(count):
+        q, out[k] = np.divmod(q, ten)
+    return out
+
+
+def fixed(values, decimals=0, grouping=False, prefix="", suffix=""):
+    """``f"{prefix}{value:,.{decimals}f}{suffix}"`` (comma only with ``grouping``)
+    for every value of an array."""
+    return template(prefix, (values, decimals, grouping), suffix)
+
+
+def usd(values, suffix=""):
+    """Whole dollars with thousands separators: ``$243,976``."""
+    return fixed(values, 0, grouping=True, prefix="$", suffix=suffix)
+
+
+def location(latitude, longitude):
+    """``34.1°N, 118.2°W`` for California coordinates (west longitudes)."""
+    return template((latitude, 1, False), "°N, ", (np.abs(longitude), 1, False), "°W")
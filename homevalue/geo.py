@@ -0,0 +1,152 @@
+"""Precomputed geographic price surface and nearest-comparable lookups.
+
+    python -m homevalue.geo build              # for the LATEST artifact
+
+``build`` prices every point of the app's lat/lon slider grid (0.1° steps) for
+a few reference property profiles and stores the result next to the artifact
+as a float32 raster, together with the training blocks for comparables.
+``PriceSurface.lookup`` is then an index computation on a memory-mapped array
+and ``Comparables.nearest`` a KD-tree query, with no model calls.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS
+from homevalue.sensitivity import PRICE_UNIT, slider_values
+
+GEO_DIR = "geo"
+EARTH_RADIUS_KM = 6371.0
+LAT, LON = FEATURES.index("Latitude"), FEATURES.index("Longitude")
+
+# Reference properties priced at every grid point (lat/lon are overwritten).
+PROFILES = {
+    "typical":     [5.0, 20, 5.0, 1.0, 1000, 3.0, 0.0, 0.0],
+    "low_income":  [2.5, 20, 5.0, 1.0, 1000, 3.0, 0.0, 0.0],
+    "high_income": [9.0, 20, 6.5, 1.1, 1000, 2.8, 0.0, 0.0],
+    "new_build":   [5.0, 5, 5.5, 1.0, 1000, 3.0, 0.0, 0.0],
+}
+
+
+def build_surface(predict, profiles=PROFILES):
+    """(n_profiles, n_lat, n_lon) float32 prices over the slider grid."""
+    lats, lons = slider_values("Latitude"), slider_values("Longitude")
+    glat, glon = np.meshgrid(lats, lons, indexing="ij")
+    raster = np.empty((len(profiles), len(lats), len(lons)), dtype=np.float32)
+    for i, base in enumerate(profiles.values()):
+        X = np.tile(np.asarray(base, dtype=np.float64), (glat.size, 1))
+        X[:, LAT], X[:, LON] = glat.ravel(), glon.ravel()
+        raster[i] = (predict(X) * PRICE_UNIT).reshape(glat.shape)
+    return raster
+
+
+def build(bundle, directory, profiles=PROFILES):
+    """Write surface.npy, blocks.npy and geo.json into directory."""
+    from homevalue.train import split_data
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "surface.npy", build_surface(bundle.predict, profiles))
+    X_train, _, y_train, _ = split_data()
+    blocks = np.column_stack([X_train, y_train * PRICE_UNIT])
+    np.save(directory / "blocks.npy", np.ascontiguousarray(blocks))
+    meta = {
+        "model_version": bundle.version,
+        "profiles": list(profiles),
+        "latitude": [SLIDERS["Latitude"]["min_value"], SLIDERS["Latitude"]["step"]],
+        "longitude": [SLIDERS["Longitude"]["min_value"], SLIDERS["Longitude"]["step"]],
+        "block_columns": FEATURES + ["Price"],
+    }
+    (directory / "geo.json").write_text(json.dumps(meta, indent=2))
+    return meta
+
+
+class PriceSurface:
+
+    def __init__(self, raster, meta):
+        self.raster = raster
+        self.profiles = meta["profiles"]
+        self.lat0, self.lat_step = meta["latitude"]
+        self.lon0, self.lon_step = meta["longitude"]
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        directory = Path(directory)
+        meta = json.loads((directory / "geo.json").read_text())
+        return cls(np.load(directory / "surface.npy", mmap_mode=mmap_mode), meta)
+
+    def index(self, lat, lon):
+        i = np.rint((np.asarray(lat, dtype=np.float64) - self.lat0) / self.lat_step).astype(int)
+        j = np.rint((np.asarray(lon, dtype=np.float64) - self.lon0) / self.lon_step).astype(int)
+        n_lat, n_lon = self.raster.shape[1:]
+        if np.any((i < 0) | (i >= n_lat) | (j < 0) | (j >= n_lon)):
+            raise ValueError("Location outside the precomputed grid")
+        return i, j
+
+    def lookup(self, lat, lon, profile="typical"):
+        """Price at the nearest grid point(s); lat/lon may be arrays."""
+        i, j = self.index(lat, lon)
+        return self.raster[self.profiles.index(profile), i, j]
+
+    def grid(self, profile="typical"):
+        """(latitudes, longitudes, prices) for a map layer."""
+        n_lat, n_lon = self.raster.shape[1:]
+        return (self.lat0 + np.arange(n_lat) * self.lat_step,
+                self.lon0 + np.arange(n_lon) * self.lon_step,
+                self.raster[self.profiles.index(profile)])
+
+
+def _unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+class Comparables:
+    """Nearest training blocks by great-circle distance (KD-tree on the unit sphere)."""
+
+    def __init__(self, blocks, columns):
+        from scipy.spatial import cKDTree
+        self.blocks = blocks
+        self.columns = columns
+        self.tree = cKDTree(_unit_vectors(blocks[:, LAT], blocks[:, LON]))
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        directory = Path(directory)
+        meta = json.loads((directory / "geo.json").read_text())
+        return cls(np.load(directory / "blocks.npy", mmap_mode=mmap_mode), meta["block_columns"])
+
+    def nearest(self, lat, lon, k=5):
+        """List of dicts for the k closest blocks, nearest first, with distance_km."""
+        chord, idx = self.tree.query(_unit_vectors([lat], [lon])[0], k=k)
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.atleast_1d(chord) / 2, 1.0))
+        return [dict(zip(self.columns, self.blocks[i].tolist()), distance_km=float(d))
+                for i, d in zip(np.atleast_1d(idx), distance)]
+
+
+def load_geo(bundle, root=None):
+    """(PriceSurface, Comparables) for a bundle, or (None, None) if not built."""
+    from homevalue.artifact import ARTIFACT_ROOT
+    directory = Path(root or ARTIFACT_ROOT) / str(bundle.version) / GEO_DIR
+    if not (directory / "geo.json").exists():
+        return None, None
+    return PriceSurface.load(directory), Comparables.load(directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the geographic price surface.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bld = commands.add_parser("build", help="price the lat/lon grid for an artifact")
+    bld.add_argument("--version", help="artifact version (default: LATEST)")
+    args = parser.parse_args(argv)
+
+    from homevalue.artifact import ARTIFACT_ROOT, load_bundle
+    bundle = load_bundle(version=args.version)
+    directory = ARTIFACT_ROOT / bundle.version / GEO_DIR
+    meta = build(bundle, directory)
+    print(f"Wrote {len(meta['profiles'])} price surfaces for {bundle.version} to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Low-overhead timing hooks exported in Prometheus text format.
+
+    with metrics.timed("predict"):
+        ...
+
+Stage timings land in the ``homevalue_stage_seconds`` histogram. Set
+``HOMEVALUE_METRICS=0`` (or call ``set_enabled(False)``) to turn every hook
+into a shared no-op context manager. ``serve(port)`` exposes ``/metrics`` from
+a background thread; the JSON API serves the same text on ``GET /metrics``.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = os.environ.get("HOMEVALUE_METRICS", "1") != "0"
+_NOOP = nullcontext()
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def enabled():
+    return _enabled
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def render(self, name, labels=()):
+        lines, cumulative = [], 0
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {total}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+    def render(self, name, labels=()):
+        return [f"{name}{_labels(labels)} {self.value}"]
+
+
+class Registry:
+    """Metric families keyed by name, each with children keyed by label values."""
+
+    def __init__(self):
+        self._families = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _child(self, kind, name, help, labels, factory):
+        with self._lock:
+            children = self._families.setdefault(name, (kind, help, {}))[2]
+            metric = children.get(labels)
+            if metric is None:
+                metric = children[labels] = factory()
+            return metric
+
+    def histogram(self, name, help, **labels):
+        return self._child("histogram", name, help, tuple(sorted(labels.items())), Histogram)
+
+    def counter(self, name, help, **labels):
+        return self._child("counter", name, help, tuple(sorted(labels.items())), Counter)
+
+    def register_collector(self, collect):
+        """collect() -> iterable of (name, type, help, value) read at scrape time.
+
+        ``name`` may carry labels, e.g. ``'x{feature="MedInc"}'``.
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            families = [(name, kind, help, list(children.items()))
+                        for name, (kind, help, children) in self._families.items()]
+        for name, kind, help, children in families:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for labels, metric in children:
+                lines += metric.render(name, labels)
+        described = set()
+        for collect in self._collectors:
+            for name, kind, help, value in collect():
+                family = name.split("{", 1)[0]
+                if family not in described:
+                    described.add(family)
+                    lines += [f"# HELP {family} {help}", f"# TYPE {family} {kind}"]
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+_stage_histograms = {}
+
+
+def _stage(stage):
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms[stage] = REGISTRY.histogram(
+            "homevalue_stage_seconds", "Time spent in each estimator stage.", stage=stage)
+    return histogram
+
+
+def timed(stage):
+    """Context manager recording the block's duration under the given stage."""
+    if not _enabled:
+        return _NOOP
+    return _Timer(_stage(stage))
+
+
+def observe(stage, seconds):
+    """Record a duration measured by the caller, for spans that are not one block."""
+    if _enabled:
+        _stage(stage).observe(seconds)
+
+
+def count(name, help, n=1):
+    if _enabled:
+        REGISTRY.counter(name, help).inc(n)
+
+
+def cache_collector(cache):
+    """Collector exposing PredictionCache counters."""
+    def collect():
+        stats = cache.stats()
+        for key in ("hits", "misses", "evictions", "expirations", "invalidations"):
+            yield (f"homevalue_cache_{key}_total", "counter",
+                   f"Prediction cache {key}.", stats[key])
+        yield "homevalue_cache_entries", "gauge", "Prediction cache size.", stats["size"]
+    return collect
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="0.0.0.0", registry=REGISTRY):
+    """Serve /metrics on a daemon thread. Returns the server."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
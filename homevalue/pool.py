@@ -0,0 +1,102 @@
+"""Multi-process inference over one memory-mapped forest.
+
+    with WorkerPool(4) as pool:
+        prices = pool.predict(X)        # model units, like ModelBundle.predict
+
+Every worker maps the artifact's ``forest/*.npy`` read-only instead of
+unpickling the sklearn model, so all workers share one copy of the trees
+through the page cache and memory stays flat as workers are added. The
+parent process is the dispatcher: it splits each batch into chunks, hands
+them to idle workers and reassembles the results in order. Results are
+identical to ``ModelBundle.predict`` (the flat forest is bit-exact with
+sklearn).
+
+A pool serves the version it was started with; start a new pool to pick up
+a newly published model.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from homevalue import FEATURES
+from homevalue.artifact import ARTIFACT_ROOT, latest_version, load_forest
+from homevalue.reload import probe_rows
+
+# Smaller chunks cost more in pickling and dispatch than they gain in parallelism.
+MIN_CHUNK_ROWS = 2048
+
+_forest = None
+
+
+def _init_worker(root, version):
+    global _forest
+    _, _forest = load_forest(root, version)
+
+
+def _predict_chunk(X):
+    return _forest.predict(X)
+
+
+def _worker_memory(X):
+    """(pid, {field: MiB}) from /proc/self/smaps_rollup after predicting ``X``.
+
+    Empty stats off Linux. Sleeps briefly so that a burst of these tasks
+    spreads over all workers.
+    """
+    _forest.predict(X)
+    time.sleep(0.05)
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty",
+                           "Shared_Clean", "Shared_Dirty"):
+                    fields[key] = int(rest.split()[0]) / 1024
+    except OSError:
+        pass
+    return os.getpid(), fields
+
+
+class WorkerPool:
+
+    def __init__(self, n_workers=None, root=ARTIFACT_ROOT, version=None,
+                 min_chunk_rows=MIN_CHUNK_ROWS):
+        self.root = root
+        self.version = version or latest_version(root)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.min_chunk_rows = min_chunk_rows
+        # spawn, not fork: the dispatcher may run inside a threaded server.
+        self._executor = ProcessPoolExecutor(
+            self.n_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(str(root), self.version))
+
+    def warm(self):
+        """Start the workers and fault in their forests. Returns {pid: memory stats}."""
+        X = probe_rows(self.min_chunk_rows)
+        return dict(self._executor.map(_worker_memory, [X] * self.n_workers * 4))
+
+    def submit(self, X):
+        """Future resolving to the predictions for ``X``, computed by one worker."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        return self._executor.submit(_predict_chunk, X)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES))
+        n_chunks = max(1, min(self.n_workers, len(X) // self.min_chunk_rows))
+        if n_chunks == 1:
+            return self.submit(X).result()
+        return np.concatenate(list(self._executor.map(_predict_chunk,
+                                                      np.array_split(X, n_chunks))))
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
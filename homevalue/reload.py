@@ -0,0 +1,132 @@
+"""Zero-downtime model hot reload.
+
+A ``ModelWatcher`` polls the artifact root's ``LATEST`` pointer. When it names
+a different version, the watcher thread loads it (checksums verified), runs
+the probe validation below, and only then rebinds ``watcher.bundle``. Callers
+read ``watcher.bundle`` once per request and keep that reference, so
+predictions already in flight finish on the old model while new ones pick up
+the new model. ``on_swap(bundle)`` runs before the rebind, so that a caller
+can switch its own state (geo index, drift monitor) first. A version that
+fails to load or validate, or whose ``on_swap`` raises, is logged and skipped
+until ``LATEST`` changes again; the current model keeps serving.
+
+Serving uses the flat forest, which is memory-mapped read-only: every process
+on a node that loads the same version shares those pages through the OS page
+cache instead of holding a private copy. Parity is checked against the probe
+prices training recorded in the manifest, so a reload does not unpickle the
+sklearn model either.
+"""
+import logging
+import threading
+
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS, metrics
+from homevalue.artifact import ARTIFACT_ROOT, ArtifactError, latest_version, load_bundle
+from homevalue.validate import check_parity
+
+log = logging.getLogger(__name__)
+
+RELOAD_INTERVAL = 10.0
+N_PROBES = 64
+
+
+def probe_rows(n=N_PROBES, seed=0):
+    """Fixed random rows spanning the slider ranges, for smoke-testing a model."""
+    rng = np.random.default_rng(seed)
+    low = np.array([SLIDERS[name]["min_value"] for name in FEATURES], dtype=np.float64)
+    high = np.array([SLIDERS[name]["max_value"] for name in FEATURES], dtype=np.float64)
+    return low + rng.random((n, len(FEATURES))) * (high - low)
+
+
+def validate_bundle(bundle):
+    """Raise ArtifactError unless ``bundle`` gives sane, parity-checked predictions.
+
+    Serving predictions on the probe rows must equal the reference prices
+    recorded at publish time (``probe_prices`` in the metadata). Artifacts
+    without them are compared with the reference path only if it is already
+    loaded. Compressed forests are not expected to match.
+
+    Also touches every tree on the serving path, so the first real request
+    after a swap does not pay for page faults.
+    """
+    X = probe_rows()
+    prices = bundle.predict(X)
+    if prices.shape != (len(X),) or not np.all(np.isfinite(prices)):
+        raise ArtifactError(f"Model {bundle.version} returned invalid predictions")
+    if bundle.forest is not None and not bundle.forest.exact:
+        return
+    expected = bundle.manifest.get("metadata", {}).get("probe_prices")
+    if expected is not None and len(expected) == len(X):
+        mismatches = int(np.count_nonzero(prices != np.asarray(expected)))
+    elif bundle.forest is None or not bundle.forest.folded:
+        mismatches = check_parity(bundle, X)
+    else:
+        # Publishing already gated parity on the held-out split.
+        return
+    if mismatches:
+        raise ArtifactError(
+            f"Model {bundle.version}: {mismatches} probe rows differ from the reference path")
+
+
+class ModelWatcher:
+
+    def __init__(self, bundle, root=ARTIFACT_ROOT, interval=RELOAD_INTERVAL, on_swap=None):
+        self.bundle = bundle
+        self.root = root
+        self.on_swap = on_swap
+        self.swaps = 0
+        self.failures = 0
+        self.last_error = None
+        self._rejected = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._loop, args=(interval,),
+                                            name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def check(self):
+        """Swap in LATEST if it changed and validates. Returns True on a swap."""
+        with self._lock:
+            try:
+                version = latest_version(self.root)
+            except ArtifactError:
+                return False
+            if version in (self.bundle.version, self._rejected):
+                return False
+            try:
+                with metrics.timed("reload"):
+                    bundle = load_bundle(self.root, version)
+                    validate_bundle(bundle)
+                if self.on_swap is not None:
+                    self.on_swap(bundle)
+            except Exception as exc:
+                self._rejected = version
+                self.failures += 1
+                self.last_error = f"{version}: {exc}"
+                log.error("Not swapping in model %s: %s", version, exc)
+                return False
+            previous, self.bundle = self.bundle, bundle
+            self._rejected = None
+            self.swaps += 1
+            metrics.count("homevalue_model_reloads_total", "Model versions hot-swapped in.")
+            log.info("Swapped model %s -> %s", previous.version, version)
+        return True
+
+    def _loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                log.exception("Model reload check failed")
+
+    def stats(self):
+        return {"version": self.bundle.version, "swaps": self.swaps,
+                "failures": self.failures, "last_error": self.last_error}
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,155 @@
+"""Headless batch scoring.
+
+    python -m homevalue.score blocks.csv priced.csv
+    python -m homevalue.score blocks.parquet priced.parquet --chunksize 200000
+    python -m homevalue.score blocks.csv priced.csv --workers 4
+    python -m homevalue.score blocks.csv priced.csv --labels
+
+Input files must contain the model's feature columns (MedInc … Longitude);
+any other columns are passed through. Files are read and written one chunk at
+a time so memory stays bounded regardless of input size. With ``--workers``
+each chunk is split across processes sharing one memory-mapped forest
+(``homevalue.pool``). ``--labels`` adds the price tier and the price as
+display text, classified and formatted a whole chunk at a time.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from homevalue import FEATURES
+from homevalue.formatting import usd
+from homevalue.tiers import tier_names
+
+PRICE_COLUMN = "PredictedPrice"
+TIER_COLUMN = "PriceTier"
+LABEL_COLUMN = "PriceLabel"
+PRICE_UNIT = 100_000
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet support needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def iter_chunks(path, chunksize):
+    if _is_parquet(path):
+        pa = _require_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self.header else "a",
+                     header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        if self.header:
+            pd.DataFrame(columns=FEATURES + [PRICE_COLUMN]).to_csv(self.path, index=False)
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        self.pa = _require_pyarrow()
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        table = self.pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pa.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path):
+    return _ParquetWriter(path) if _is_parquet(path) else _CsvWriter(path)
+
+
+def score_frame(predictor, frame, labels=False):
+    missing = [name for name in FEATURES if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {', '.join(missing)}")
+    X = frame[FEATURES].to_numpy(dtype=np.float64)
+    prices = predictor.predict(X) * PRICE_UNIT
+    frame[PRICE_COLUMN] = prices
+    if labels:
+        frame[TIER_COLUMN] = tier_names(prices)
+        frame[LABEL_COLUMN] = usd(prices)
+    return frame
+
+
+def score_file(predictor, src, dst, chunksize=100_000, log=sys.stderr, labels=False):
+    """Score src into dst chunk by chunk with ``predictor`` (a ModelBundle or
+    WorkerPool). Returns (rows, seconds)."""
+    writer = open_writer(dst)
+    rows, start = 0, time.perf_counter()
+    try:
+        for frame in iter_chunks(src, chunksize):
+            writer.write(score_frame(predictor, frame, labels))
+            rows += len(frame)
+            if log:
+                elapsed = time.perf_counter() - start
+                print(f"  {rows:>12,} rows  {rows / elapsed:>12,.0f} rows/s", file=log)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of blocks.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                        help="rows per chunk (bounds memory use)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="score in this many processes (needs a published artifact)")
+    parser.add_argument("--labels", action="store_true",
+                        help=f"add {TIER_COLUMN} and {LABEL_COLUMN} (formatted USD) columns")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    log = None if args.quiet else sys.stderr
+    if args.workers:
+        from homevalue.pool import WorkerPool
+        with WorkerPool(args.workers) as pool:
+            pool.warm()
+            rows, seconds = score_file(pool, args.input, args.output, args.chunksize, log,
+                                       args.labels)
+        version = pool.version
+    else:
+        from homevalue.train import load_or_train
+        bundle = load_or_train()
+        bundle.reference_batches = True
+        rows, seconds = score_file(bundle, args.input, args.output, args.chunksize, log,
+                                   args.labels)
+        version = bundle.version
+    print(f"Scored {rows:,} rows in {seconds:.2f}s "
+          f"({rows / max(seconds, 1e-9):,.0f} rows/s) with model {version}")
+
+
+if __name__ == "__main__":
+    main()
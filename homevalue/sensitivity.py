@@ -0,0 +1,54 @@
+"""What-if sensitivity sweeps over the slider ranges.
+
+A sweep holds the current feature vector fixed, varies one or two features
+across their slider range and prices the whole grid with a single batched
+prediction.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from homevalue import FEATURES, SLIDERS
+
+PRICE_UNIT = 100_000
+
+Sweep = namedtuple("Sweep", "feature values prices")
+Sweep2D = namedtuple("Sweep2D", "features values prices")
+
+
+def slider_values(name, points=None):
+    """Grid over a slider's range: every step, or ``points`` evenly spaced values."""
+    spec = SLIDERS[name]
+    lo, hi = spec["min_value"], spec["max_value"]
+    if points:
+        return np.linspace(lo, hi, points)
+    n = int((hi - lo) / spec["step"] + 1e-9)
+    return np.round(lo + np.arange(n + 1) * spec["step"], 10)
+
+
+def _grid(base, columns):
+    base = np.asarray(base, dtype=np.float64).reshape(len(FEATURES))
+    n = len(next(iter(columns.values())))
+    X = np.tile(base, (n, 1))
+    for name, values in columns.items():
+        X[:, FEATURES.index(name)] = values
+    return X
+
+
+def sweep(predict, base, feature, points=None):
+    """Price as a function of one feature, all others held at ``base``."""
+    values = slider_values(feature, points)
+    prices = predict(_grid(base, {feature: values})) * PRICE_UNIT
+    return Sweep(feature, values, prices)
+
+
+def sweep_2d(predict, base, feature_x, feature_y, points_x=None, points_y=None):
+    """Price over a two-feature grid; ``prices[i, j]`` is at (x[i], y[j])."""
+    if feature_x == feature_y:
+        raise ValueError("Pick two different features")
+    xs = slider_values(feature_x, points_x)
+    ys = slider_values(feature_y, points_y)
+    gx, gy = np.meshgrid(xs, ys, indexing="ij")
+    X = _grid(base, {feature_x: gx.ravel(), feature_y: gy.ravel()})
+    prices = (predict(X) * PRICE_UNIT).reshape(len(xs), len(ys))
+    return Sweep2D((feature_x, feature_y), (xs, ys), prices)
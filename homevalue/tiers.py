@@ -0,0 +1,31 @@
+"""Price tiers shown with every estimate.
+
+``TIERS`` is the single table of tiers: a price in USD belongs to the last
+tier whose lower bound it reaches. ``tier_codes`` classifies whole arrays
+with one ``searchsorted`` over the bounds; codes index ``TIER_NAMES`` and
+``TIER_COLORS`` and are what the bulk API returns.
+"""
+import numpy as np
+
+# (lower bound in USD, name, badge colour), cheapest first.
+TIERS = (
+    (0, "Budget Friendly", "rgba(91,123,106,0.85)"),
+    (120_000, "Mid Range", "rgba(70,130,160,0.85)"),
+    (250_000, "Above Average", "rgba(196,149,106,0.9)"),
+    (450_000, "Premium", "rgba(175,95,65,0.85)"),
+    (700_000, "Luxury", "rgba(135,85,160,0.85)"),
+)
+TIER_BOUNDS = np.array([bound for bound, _, _ in TIERS[1:]], dtype=np.float64)
+TIER_NAMES = tuple(name for _, name, _ in TIERS)
+TIER_COLORS = tuple(color for _, _, color in TIERS)
+_NAMES = np.array(TIER_NAMES)
+
+
+def tier_codes(prices):
+    """uint8 tier code per price (USD)."""
+    return np.searchsorted(TIER_BOUNDS, prices, side="right").astype(np.uint8)
+
+
+def tier_names(prices):
+    """Tier name per price, as a NumPy string array."""
+    return _NAMES[tier_codes(prices)]
@@ -0,0 +1,169 @@
+"""Offline training entry point.
+
+    python -m homevalue.train                              # train and publish a new artifact
+    python -m homevalue.train --grow-from latest --n-estimators 300
+    python -m homevalue.train --engine hgb                 # gradient boosting instead
+
+Fitting uses all cores by default. Forests are seeded per tree, so the fitted
+model is identical for a given random_state whatever the number of jobs, and
+growing an existing forest with warm start yields the same trees as training
+the larger forest from scratch.
+
+scikit-learn is imported only when training or splitting actually runs, so
+serving code can import ``load_or_train`` without paying for it.
+"""
+import argparse
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from homevalue.artifact import (ARTIFACT_ROOT, ArtifactNotFoundError,
+                                ModelBundle, export_forest, load_bundle,
+                                save_bundle)
+from homevalue.dataset import load_or_import
+from homevalue.drift import feature_profile
+from homevalue.engines import DEFAULT_ENGINE, ENGINES, artifact_engine, get_engine
+from homevalue.reload import probe_rows
+from homevalue.validate import check_parity
+
+RANDOM_STATE = 42
+N_ESTIMATORS = 100
+TEST_SIZE = 0.2
+STAGES = ("load", "split", "scale", "fit", "evaluate")
+
+
+def split_data(random_state=RANDOM_STATE):
+    from sklearn.model_selection import train_test_split
+    X, y = load_or_import()
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=random_state)
+
+
+@contextmanager
+def _stage(timings, name):
+    start = time.perf_counter()
+    yield
+    timings[name] = round(time.perf_counter() - start, 3)
+
+
+def train_model(n_estimators=N_ESTIMATORS, random_state=RANDOM_STATE, n_jobs=-1,
+                base=None, params=None, engine=DEFAULT_ENGINE):
+    """Fit scaler + model on the standard split. Returns (model, scaler, metadata).
+
+    ``engine`` names the model family (see ``homevalue.engines``). ``base`` is
+    an optional ``(model, scaler)`` pair to grow with warm start instead of
+    fitting from scratch; it is modified in place. ``params`` are extra
+    estimator arguments such as ``max_depth``.
+    """
+    from sklearn.metrics import mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    engine = get_engine(engine)
+    engine.check_params(params)
+    timings = {}
+    with _stage(timings, "load"):
+        X, y = load_or_import()
+    with _stage(timings, "split"):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=TEST_SIZE, random_state=random_state)
+    with _stage(timings, "scale"):
+        if base is None:
+            scaler = StandardScaler()
+            X_train_scaled = scaler.fit_transform(X_train)
+        else:
+            scaler = base[1]
+            X_train_scaled = scaler.transform(X_train)
+    with _stage(timings, "fit"):
+        if base is None:
+            model = engine.build(n_estimators, random_state, n_jobs, params)
+        else:
+            model = base[0]
+            engine.grow(model, n_estimators, random_state, n_jobs)
+        model.fit(X_train_scaled, y_train)
+        engine.finish(model)
+    with _stage(timings, "evaluate"):
+        y_pred = model.predict(scaler.transform(X_test))
+        r2 = float(r2_score(y_test, y_pred))
+        rmse = float(np.sqrt(mean_squared_error(y_test, y_pred)))
+
+    metadata = {
+        "engine": engine.name,
+        "algorithm": type(model).__name__,
+        "params": {"n_estimators": n_estimators, "random_state": random_state, **params},
+        "n_train": len(X_train),
+        "n_test": len(X_test),
+        "r2": r2,
+        "rmse": rmse,
+        "timings": timings,
+        "feature_profile": feature_profile(X_train),
+        "train_seconds": round(sum(timings.values()), 3),
+    }
+    return model, scaler, metadata
+
+
+def load_or_train(root=ARTIFACT_ROOT):
+    """Load the latest artifact, training in memory only when none exists."""
+    try:
+        return load_bundle(root)
+    except ArtifactNotFoundError:
+        model, scaler, metadata = train_model()
+        return ModelBundle(model, scaler, {"version": "untracked", "metadata": metadata},
+                           export_forest(model, scaler))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and publish a model artifact.")
+    parser.add_argument("--out", default=str(ARTIFACT_ROOT), help="artifact root directory")
+    parser.add_argument("--engine", choices=list(ENGINES),
+                        help=f"model family (default {DEFAULT_ENGINE}, or the grown artifact's)")
+    parser.add_argument("--n-estimators", type=int, default=N_ESTIMATORS,
+                        help="trees (forest) or boosting iterations (hgb)")
+    parser.add_argument("--random-state", type=int, default=RANDOM_STATE)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="cores to fit with (-1 = all)")
+    parser.add_argument("--max-depth", type=int, help="limit tree depth (smaller model)")
+    parser.add_argument("--max-leaf-nodes", type=int, help="limit leaves per tree")
+    parser.add_argument("--min-samples-leaf", type=int)
+    parser.add_argument("--learning-rate", type=float, help="boosting step size (hgb only)")
+    parser.add_argument("--grow-from", metavar="VERSION",
+                        help="add trees to an existing artifact ('latest' or a version)")
+    args = parser.parse_args(argv)
+
+    base, engine = None, args.engine or DEFAULT_ENGINE
+    if args.grow_from:
+        version = None if args.grow_from == "latest" else args.grow_from
+        previous = load_bundle(args.out, version=version)
+        base = (previous.model, previous.scaler)
+        engine = artifact_engine(previous.manifest)
+        if args.engine and args.engine != engine:
+            raise SystemExit(f"Artifact {previous.version} was trained with the {engine} "
+                             f"engine, not {args.engine}")
+    params = {"max_depth": args.max_depth, "max_leaf_nodes": args.max_leaf_nodes,
+              "min_samples_leaf": args.min_samples_leaf, "learning_rate": args.learning_rate}
+    try:
+        model, scaler, metadata = train_model(args.n_estimators, args.random_state,
+                                              args.n_jobs, base, params, engine)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    if base is not None:
+        metadata["grown_from"] = previous.version
+    forest = export_forest(model, scaler)
+    candidate = ModelBundle(model, scaler, {}, forest)
+    if forest is not None:
+        X_test = split_data(args.random_state)[1]
+        mismatches = check_parity(candidate, X_test)
+        if mismatches:
+            raise SystemExit(f"Flat forest disagrees with sklearn on {mismatches} rows; "
+                             "not publishing.")
+    # Hot reload checks the serving path against these without sklearn.
+    metadata["probe_prices"] = candidate.predict_reference(probe_rows()).tolist()
+    version = save_bundle(model, scaler, metadata, root=args.out, forest=forest)
+    stages = "  ".join(f"{name} {metadata['timings'][name]:.2f}s" for name in STAGES)
+    print(f"Published {version} ({engine}) to {args.out}  "
+          f"(R² {metadata['r2']:.3f}, RMSE {metadata['rmse']:.3f}, "
+          f"{metadata['train_seconds']:.1f}s)\n  {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Hyperparameter search: k-fold CV with successive halving and a Pareto front.
+
+    python -m homevalue.tune [--engines forest hgb] [--folds 5] [--jobs -1]
+
+Every configuration in ``SPACES`` is cross-validated on the training part of
+the standard ``random_state=42`` split (the test rows stay held out), one
+(configuration, fold) fit per task across all cores. Successive halving
+starts every configuration on 1/eta² of each fold's training rows and
+promotes the best 1/eta to the next rung with eta times the rows. Candidates
+are ranked by Pareto layer (CV R² vs. single-row latency vs. model size),
+then by R², so cheap models are not dropped just for being a little less
+accurate. The output is the Pareto front of the last rung, each with the
+``homevalue.train`` arguments that publish it.
+
+Each finished fold is cached as JSON under ``--cache-dir``, keyed by the
+configuration, fold, row budget, random_state, data hash and scikit-learn
+version, so an interrupted or repeated search only fits what is missing.
+Latencies are measured in the fold workers while other fits run; compare them
+with each other rather than with ``benchmarks/``.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+
+from homevalue.artifact import ARTIFACT_ROOT, ModelBundle, export_forest
+from homevalue.engines import ENGINES, get_engine, single_row_ms
+from homevalue.train import RANDOM_STATE, split_data
+
+CACHE_DIR = ARTIFACT_ROOT / ".tune-cache"
+CACHE_FORMAT = 1
+N_FOLDS = 5
+ETA = 3
+N_RUNGS = 3
+
+SPACES = {
+    "forest": {"n_estimators": [50, 100, 200], "max_depth": [None, 16],
+               "min_samples_leaf": [1, 4]},
+    "hgb": {"n_estimators": [100, 200, 400], "learning_rate": [0.05, 0.1, 0.2],
+            "max_leaf_nodes": [15, 31, 63]},
+}
+# (key, larger is better) for Pareto dominance.
+OBJECTIVES = (("r2", True), ("single_ms", False), ("mb", False))
+
+
+def configs(engines=tuple(SPACES)):
+    """Every point of the grid for each engine, as flat dicts with an ``engine`` key."""
+    for engine in engines:
+        space = SPACES[engine]
+        for values in itertools.product(*space.values()):
+            yield {"engine": engine, **dict(zip(space, values))}
+
+
+def data_hash(X, y):
+    digest = hashlib.sha256()
+    for array in (X, y):
+        digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+def cache_key(config, fold, n_folds, rows, data):
+    import sklearn
+    key = {"format": CACHE_FORMAT, "config": config, "fold": fold, "n_folds": n_folds,
+           "rows": rows, "random_state": RANDOM_STATE, "data": data,
+           "sklearn": sklearn.__version__}
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _read_cached(path):
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def fit_fold(config, X, y, train, test, path):
+    """Fit one configuration on one fold, cache and return its scores."""
+    from sklearn.preprocessing import StandardScaler
+    engine = get_engine(config["engine"])
+    params = {k: v for k, v in config.items()
+              if k not in ("engine", "n_estimators") and v is not None}
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    # One core per fit: the search is parallel across folds instead.
+    model = engine.build(config["n_estimators"], RANDOM_STATE, 1, params)
+    model.fit(scaler.fit_transform(X[train]), y[train])
+    engine.finish(model)
+    fit_seconds = time.perf_counter() - start
+
+    residual = y[test] - model.predict(scaler.transform(X[test]))
+    forest = export_forest(model, scaler)
+    bundle = ModelBundle(model, scaler, {}, forest)
+    size = len(pickle.dumps((model, scaler))) + (forest.nbytes if forest is not None else 0)
+    result = {
+        "r2": float(1 - np.sum(residual ** 2) / np.sum((y[test] - y[test].mean()) ** 2)),
+        "rmse": float(np.sqrt(np.mean(residual ** 2))),
+        "fit_seconds": fit_seconds,
+        "single_ms": single_row_ms(bundle, X[test], n=50),
+        "mb": size / 1e6,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(result))
+    os.replace(tmp, path)
+    return result
+
+
+def dominates(a, b):
+    better = False
+    for key, larger in OBJECTIVES:
+        x, y = (a[key], b[key]) if larger else (b[key], a[key])
+        if x < y:
+            return False
+        better = better or x > y
+    return better
+
+
+def pareto_layers(results):
+    """Split results into successive non-dominated layers (first = Pareto front)."""
+    remaining, layers = list(results), []
+    while remaining:
+        front = [r for r in remaining if not any(dominates(o, r) for o in remaining)]
+        layers.append(front)
+        remaining = [r for r in remaining if r not in front]
+    return layers
+
+
+def rank(results):
+    """Results ordered by Pareto layer, then by CV R² within a layer."""
+    return [r for layer in pareto_layers(results)
+            for r in sorted(layer, key=lambda r: -r["r2"])]
+
+
+def _summarize(config, folds):
+    summary = {"config": config}
+    for key in ("r2", "rmse", "fit_seconds", "single_ms", "mb"):
+        summary[key] = float(np.mean([fold[key] for fold in folds]))
+    summary["r2_std"] = float(np.std([fold["r2"] for fold in folds]))
+    return summary
+
+
+def search(engines=tuple(SPACES), n_folds=N_FOLDS, eta=ETA, n_rungs=N_RUNGS, n_jobs=-1,
+           cache_dir=CACHE_DIR, log=print):
+    """Run the halving search. Returns the ranked summaries of the last rung."""
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import KFold
+
+    X_train, _, y_train, _ = split_data()
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    # Shuffle once so that a prefix of any fold's (sorted) training indices is
+    # a random subset: that prefix is the row budget of the lower rungs.
+    order = np.random.default_rng(RANDOM_STATE).permutation(len(X_train))
+    X_train, y_train = X_train[order], y_train[order]
+    data = data_hash(X_train, y_train)
+    folds = list(KFold(n_folds).split(X_train))
+    cache_dir = Path(cache_dir)
+
+    candidates = list(configs(engines))
+    summaries = []
+    for rung in range(n_rungs):
+        fraction = eta ** (rung - n_rungs + 1)
+        tasks, results = [], {}
+        for i, config in enumerate(candidates):
+            for fold, (train, test) in enumerate(folds):
+                rows = max(1, math.ceil(len(train) * fraction))
+                path = cache_dir / f"{cache_key(config, fold, n_folds, rows, data)}.json"
+                cached = _read_cached(path)
+                if cached is not None:
+                    results[i, fold] = cached
+                else:
+                    tasks.append(((i, fold), (config, X_train, y_train, train[:rows], test,
+                                              path)))
+        start = time.perf_counter()
+        fitted = Parallel(n_jobs=n_jobs)(delayed(fit_fold)(*args) for _, args in tasks)
+        results.update(zip((key for key, _ in tasks), fitted))
+        log(f"rung {rung + 1}/{n_rungs}: {len(candidates)} configs x {n_folds} folds on "
+            f"{fraction:.0%} of rows, {len(tasks)} fitted, "
+            f"{len(results) - len(tasks)} cached ({time.perf_counter() - start:.1f}s)")
+        summaries = rank([_summarize(config, [results[i, fold] for fold in range(n_folds)])
+                          for i, config in enumerate(candidates)])
+        candidates = [s["config"] for s in summaries[:math.ceil(len(summaries) / eta)]]
+    return summaries
+
+
+def train_args(config):
+    """``python -m homevalue.train`` arguments that publish ``config``."""
+    args = [f"--{key.replace('_', '-')} {value}" for key, value in config.items()
+            if value is not None]
+    return " ".join(args)
+
+
+def report(summaries):
+    front = pareto_layers(summaries)[0]
+    print(f"\n{'':2}{'engine':<7} {'CV R²':>6} {'±':>5} {'RMSE':>6} {'fit s':>6} "
+          f"{'1-row ms':>8} {'MB':>7}  train arguments")
+    for s in summaries:
+        mark = "*" if s in front else ""
+        print(f"{mark:<2}{s['config']['engine']:<7} {s['r2']:>6.3f} {s['r2_std']:>5.3f} "
+              f"{s['rmse']:>6.3f} {s['fit_seconds']:>6.2f} {s['single_ms']:>8.3f} "
+              f"{s['mb']:>7.1f}  {train_args(s['config'])}")
+    print("* Pareto front: no other configuration is at least as accurate, fast and small")
+    return front
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(SPACES))
+    parser.add_argument("--folds", type=int, default=N_FOLDS)
+    parser.add_argument("--eta", type=int, default=ETA,
+                        help="keep 1/eta of the configurations per rung")
+    parser.add_argument("--rungs", type=int, default=N_RUNGS,
+                        help="halving rungs; the last uses all training rows")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1 = all cores)")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    args = parser.parse_args(argv)
+    summaries = search(args.engines, args.folds, args.eta, args.rungs, args.jobs,
+                       args.cache_dir)
+    report(summaries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Parity check between the serving path and the sklearn reference path.
+
+    python -m homevalue.validate          # exits non-zero on any mismatch
+
+The serving forest has the StandardScaler folded into its thresholds and is
+fed raw features; the reference path is the original ``scaler.transform`` +
+``model.predict``. Predictions on the held-out split
+(``train_test_split(random_state=42)``) must be bit-for-bit identical.
+"""
+import argparse
+
+import numpy as np
+
+
+def check_parity(bundle, X):
+    """Number of rows where the flat forest and ``predict_reference`` differ."""
+    if bundle.forest is None or not bundle.forest.exact:
+        return 0
+    reference = bundle.predict_reference(X)
+    fast = bundle.predict_flat(X)
+    return int(np.count_nonzero(fast != reference))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check serving/reference parity.")
+    parser.add_argument("--version", help="artifact version (default: LATEST)")
+    args = parser.parse_args(argv)
+
+    from homevalue.artifact import load_bundle
+    from homevalue.train import split_data
+
+    bundle = load_bundle(version=args.version)
+    X_test = split_data()[1]
+    if bundle.forest is not None and not bundle.forest.exact:
+        print(f"{bundle.version}: compressed forest, parity not expected")
+        return
+    mismatches = check_parity(bundle, X_test)
+    print(f"{bundle.version}: {len(X_test) - mismatches}/{len(X_test)} rows identical")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Prediction service behaviour behind the HTTP handler."""
+import numpy as np
+import pytest
+
+from homevalue.api import PRICE_UNIT, PredictionService, ValidationError, parse_payload
+
+ROW = [5.0, 20, 5.0, 1.0, 1000, 3.0, 34.0, -118.0]
+NEAR = [5.04, 20, 5.0, 1.0, 1020, 3.0, 34.04, -118.03]
+
+
+class LinearBundle:
+    """Stands in for a ModelBundle: price is a fixed linear function of the row."""
+    forest = None
+
+    def __init__(self, version="v1", scale=1.0):
+        self.version = version
+        self.weights = np.arange(1, 9, dtype=np.float64) / 100 * scale
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(X, dtype=np.float64).reshape(-1, 8) @ self.weights
+
+
+def test_api_single_rows_match_instances():
+    bundle = LinearBundle()
+    service = PredictionService(bundle)
+    first = service.predict({"features": ROW})["price"]
+    single = service.predict({"features": NEAR})["price"]
+    batch = service.predict({"instances": [NEAR]})["prices"][0]
+    assert single == batch != first
+    assert single == float(bundle.predict([NEAR])[0]) * PRICE_UNIT
+    calls = bundle.calls
+    assert service.predict({"features": NEAR})["price"] == single
+    assert bundle.calls == calls
+
+
+class SwappingBatcher:
+    """Runs the batch only after a newer model has been swapped in."""
+
+    def __init__(self, service, bundle):
+        self.service, self.bundle = service, bundle
+
+    def predict_one(self, row):
+        self.service.swap(self.bundle)
+        return self.service.predict_versioned(np.array([row]))[0]
+
+
+def test_batched_rows_report_the_version_that_ran():
+    old, new = LinearBundle("v1"), LinearBundle("v2", scale=2.0)
+    service = PredictionService(old)
+    service.batcher = SwappingBatcher(service, new)
+    result = service.predict({"features": ROW})
+    assert result == {"version": "v2", "price": float(new.predict([ROW])[0]) * PRICE_UNIT}
+    assert service.cache.get("v2", ROW) == new.predict([ROW])[0]
+    assert service.cache.get("v1", ROW) is None
+
+
+@pytest.mark.parametrize("value", [10 ** 400, float("nan"), True, "5"])
+def test_non_finite_or_non_numeric_features_are_rejected(value):
+    with pytest.raises(ValidationError, match="MedInc must be a finite number"):
+        parse_payload({"features": [value] + ROW[1:]})
@@ -0,0 +1,102 @@
+"""Micro-batcher fan-out: every caller gets its own row's result."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from homevalue.batching import MicroBatcher
+
+
+class RecordingModel:
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, X):
+        with self._lock:
+            self.batch_sizes.append(len(X))
+        # A row's result depends on the row only, so misrouting shows up.
+        return X[:, 0] * 1000 + X[:, 1]
+
+
+def rows(n):
+    X = np.zeros((n, 8))
+    X[:, 0] = np.arange(n)
+    X[:, 1] = np.arange(n) % 7
+    return X
+
+
+def test_each_caller_gets_its_own_result():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=16, max_wait_ms=20)
+    X = rows(200)
+    try:
+        with ThreadPoolExecutor(32) as pool:
+            results = list(pool.map(batcher.predict_one, X))
+    finally:
+        batcher.close()
+    np.testing.assert_array_equal(results, X[:, 0] * 1000 + X[:, 1])
+    assert sum(model.batch_sizes) == 200
+    assert max(model.batch_sizes) <= 16
+    assert len(model.batch_sizes) < 200
+    assert batcher.stats()["rows"] == 200
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def fail(X):
+        raise ValueError("boom")
+    batcher = MicroBatcher(fail, max_batch_size=8, max_wait_ms=20)
+    try:
+        futures = [batcher.submit(row) for row in rows(8)]
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result(5)
+    finally:
+        batcher.close()
+
+
+def test_close_serves_queued_rows_then_rejects():
+    batcher = MicroBatcher(RecordingModel(), max_batch_size=64, max_wait_ms=1000)
+    futures = [batcher.submit(row) for row in rows(5)]
+    batcher.close()
+    assert [f.result(5) for f in futures] == [0, 1001, 2002, 3003, 4004]
+    with pytest.raises(RuntimeError):
+        batcher.submit(rows(1)[0])
+
+
+def test_cancelled_callers_are_skipped():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, max_wait_ms=200)
+    X = rows(4)
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(batcher.predict_async(X[1]))
+        kept = [asyncio.ensure_future(batcher.predict_async(row)) for row in X[[0, 2, 3]]]
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        return await asyncio.wait_for(asyncio.gather(*kept), 5)
+
+    try:
+        assert asyncio.run(scenario()) == [0, 2002, 3003]
+        assert model.batch_sizes == [3]
+        assert batcher.predict_one(X[1], timeout=5) == 1001
+    finally:
+        batcher.close()
+
+
+def test_a_failed_fan_out_does_not_stop_the_thread():
+    def short(X):
+        return X[:-1, 0]
+    batcher = MicroBatcher(short, max_batch_size=2, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(row) for row in rows(2)]
+        assert futures[0].result(5) == 0
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+        batcher.predict = RecordingModel()
+        assert batcher.predict_one(rows(3)[2], timeout=5) == 2002
+    finally:
+        batcher.close()
@@ -0,0 +1,45 @@
+"""Packed bulk request/response format."""
+import numpy as np
+import pytest
+
+from homevalue import FEATURES, bulk
+from homevalue.reload import probe_rows
+from homevalue.tiers import tier_codes
+
+
+@pytest.mark.parametrize("dtype", list(bulk.DTYPES))
+def test_rows_round_trip(dtype):
+    X = probe_rows(100).astype(dtype)
+    body = bulk.encode_rows(X, dtype)
+    assert len(body) == X.size * X.itemsize
+    np.testing.assert_array_equal(bulk.decode_rows(body, dtype), X)
+
+
+@pytest.mark.parametrize("dtype", list(bulk.DTYPES))
+def test_result_round_trip(dtype):
+    prices = np.array([95_000.5, 130_000.25, 800_000.0])
+    body = bulk.encode_result(prices, tier_codes(prices), dtype)
+    decoded, codes = bulk.decode_result(body, dtype)
+    np.testing.assert_array_equal(decoded, prices.astype(dtype))
+    assert codes.tolist() == [0, 1, 4]
+
+
+def test_decode_rejects_partial_rows_and_unknown_dtypes():
+    with pytest.raises(ValueError, match="multiple of 32 bytes"):
+        bulk.decode_rows(b"\0" * 33)
+    with pytest.raises(ValueError, match="non-empty"):
+        bulk.decode_rows(b"")
+    with pytest.raises(ValueError, match="dtype must be one of"):
+        bulk.decode_rows(b"\0" * 32, "int8")
+
+
+def test_check_rows_names_the_first_bad_row_and_column():
+    X = probe_rows(10)
+    bulk.check_rows(X)
+    X[7, FEATURES.index("Latitude")] = 50.0
+    X[3, FEATURES.index("HouseAge")] = np.nan
+    with pytest.raises(ValueError, match=r"rows\[3\]: HouseAge=nan outside \[1, 52\]"):
+        bulk.check_rows(X)
+    X[3, FEATURES.index("HouseAge")] = 10
+    with pytest.raises(ValueError, match=r"rows\[7\]: Latitude=50.0 outside \[32, 42\]"):
+        bulk.check_rows(X)
@@ -0,0 +1,55 @@
+"""Prediction cache keys, eviction, expiry and version invalidation."""
+import numpy as np
+
+from homevalue.cache import PredictionCache, quantize, row_key
+
+ROW = [5.0, 20, 5.0, 1.0, 1000, 3.0, 34.0, -118.0]
+NEAR = [5.04, 20, 5.0, 1.0, 1020, 3.0, 34.04, -118.03]
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_quantize_snaps_to_the_slider_grid():
+    assert quantize(ROW) == quantize(NEAR)
+    assert quantize(ROW) != quantize([5.1] + ROW[1:])
+
+
+def test_row_key_is_exact():
+    assert row_key(ROW) == row_key(np.array(ROW))
+    assert row_key(ROW) != row_key(NEAR)
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(maxsize=2, ttl=10.0, clock=clock, key=row_key)
+    rows = [[float(i)] * 8 for i in range(3)]
+    for i, row in enumerate(rows):
+        cache.put("v1", row, i)
+    assert cache.get("v1", rows[0]) is None
+    assert cache.get("v1", rows[2]) == 2
+    clock.now = 11.0
+    assert cache.get("v1", rows[2]) is None
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expirations"], stats["hits"]) == (1, 1, 1)
+
+
+def test_new_version_invalidates():
+    cache = PredictionCache()
+    cache.put("v1", ROW, 1.0)
+    assert cache.get("v2", ROW) is None
+    assert cache.stats()["invalidations"] == 1 and len(cache) == 0
+
+
+def test_get_or_compute_calls_once():
+    cache, calls = PredictionCache(), []
+    for _ in range(3):
+        value = cache.get_or_compute("v1", ROW, lambda: calls.append(1) or 7.0)
+    assert value == 7.0 and len(calls) == 1
+
@@ -0,0 +1,54 @@
+"""Drift scores on live rows vs. the training profile, and the bounded buffer."""
+import numpy as np
+
+from homevalue import FEATURES
+from homevalue.drift import PSI_ALERT, DriftMonitor, feature_profile, psi
+from homevalue.reload import probe_rows
+
+TRAINING = probe_rows(20_000, seed=1)
+
+
+def monitor(**kwargs):
+    return DriftMonitor(feature_profile(TRAINING), interval=0, **kwargs)
+
+
+def test_psi():
+    assert psi([0.5, 0.5], [0.5, 0.5]) == 0
+    assert psi([0.5, 0.5], [0.9, 0.1]) > psi([0.5, 0.5], [0.6, 0.4]) > 0
+
+
+def test_profile_proportions():
+    profile = feature_profile(TRAINING)
+    for name in FEATURES:
+        proportions = np.array(profile[name]["proportions"])
+        assert len(proportions) == len(profile[name]["edges"]) + 1
+        np.testing.assert_allclose(proportions.sum(), 1)
+
+
+def test_only_shifted_features_drift():
+    drift = monitor()
+    live = probe_rows(5000, seed=2)
+    live[:, FEATURES.index("MedInc")] *= 1.5
+    drift.observe(live)
+    scores = drift.update()
+    assert scores["MedInc"] > PSI_ALERT
+    assert all(score < 0.1 for name, score in scores.items() if name != "MedInc")
+
+
+def test_no_scores_below_min_rows():
+    drift = monitor(min_rows=500)
+    drift.observe(probe_rows(100, seed=3))
+    assert drift.update() == {}
+
+
+def test_overflow_is_sampled_and_counted_in_rows():
+    drift = monitor(buffer_size=1000)
+    drift.observe(probe_rows(300, seed=4))
+    drift.observe(probe_rows(5000, seed=5))
+    drift.observe(probe_rows(10, seed=6))
+    assert drift.dropped == 300 + 5000 + 10 - 1000
+    drift.update()
+    assert drift.stats()["observed"] == 1000
+    drift.observe(probe_rows(10, seed=7))
+    drift.update()
+    assert drift.stats()["observed"] == 1010
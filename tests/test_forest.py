@@ -0,0 +1,115 @@
+"""Parity of the flat, scaler-folded forest with scaler + sklearn."""
+import numpy as np
+import pytest
+
+from homevalue import FEATURES
+from homevalue.artifact import ModelBundle, export_forest
+from homevalue.forest import _scaled, fold_thresholds
+from homevalue.reload import probe_rows
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    X = probe_rows(3000, seed=1)
+    noise = np.random.default_rng(1).normal(0, 0.2, len(X))
+    y = X[:, 0] * 0.4 - np.abs(X[:, 6] - 37) * 0.3 + noise
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=10, random_state=42, n_jobs=1)
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+@pytest.fixture(scope="module")
+def bundle(fitted):
+    model, scaler = fitted
+    return ModelBundle(model, scaler, {"version": "test"}, export_forest(model, scaler))
+
+
+def threshold_rows(forest, seed=0):
+    """Rows whose split feature sits exactly at, just above and just below each
+    folded threshold."""
+    split = np.isfinite(forest.threshold)
+    features, thresholds = forest.feature[split], forest.threshold[split]
+    values = np.concatenate([thresholds, np.nextafter(thresholds, np.inf),
+                             np.nextafter(thresholds, -np.inf)])
+    X = probe_rows(len(values), seed=seed)
+    X[np.arange(len(values)), np.tile(features, 3)] = values
+    return X
+
+
+def test_flat_matches_reference_bit_for_bit(bundle):
+    X = probe_rows(2000, seed=2)
+    assert bundle.forest.folded and bundle.forest.exact
+    np.testing.assert_array_equal(bundle.predict_flat(X), bundle.predict_reference(X))
+
+
+def test_parity_at_folded_thresholds(bundle):
+    X = threshold_rows(bundle.forest)
+    np.testing.assert_array_equal(bundle.predict_flat(X), bundle.predict_reference(X))
+
+
+def test_fold_thresholds_is_the_exact_boundary(fitted):
+    _, scaler = fitted
+    rng = np.random.default_rng(3)
+    feature = rng.integers(0, len(FEATURES), 5000)
+    threshold = rng.normal(0, 2, 5000).astype(np.float32).astype(np.float64)
+    mean, scale = scaler.mean_[feature], scaler.scale_[feature]
+    raw = fold_thresholds(threshold, mean, scale)
+    assert np.all(_scaled(raw, mean, scale) <= threshold)
+    assert np.all(_scaled(np.nextafter(raw, np.inf), mean, scale) > threshold)
+
+
+def test_compressed_forest_is_not_exact(bundle):
+    assert not bundle.forest.compress(np.float32).exact
+    assert not bundle.forest.prune(5).exact
+
+
+def test_parity_on_held_out_split():
+    from homevalue.dataset import DatasetMissingError, load_dataset
+    from homevalue.train import split_data, train_model
+    try:
+        load_dataset()
+    except DatasetMissingError:
+        pytest.skip("California housing data not imported")
+    model, scaler, _ = train_model(n_estimators=10, n_jobs=1)
+    bundle = ModelBundle(model, scaler, {}, export_forest(model, scaler))
+    X_test = split_data()[1]
+    np.testing.assert_array_equal(bundle.predict_flat(X_test), bundle.predict_reference(X_test))
+
+
+
+def test_interval_mean_is_the_prediction(bundle):
+    X = probe_rows(2000, seed=4)
+    mean, lower, upper = bundle.predict_interval(X, 0.9)
+    np.testing.assert_array_equal(mean, bundle.predict(X))
+    assert np.all(lower <= mean) and np.all(mean <= upper)
+    trees = bundle.forest.leaf_values(X)
+    assert np.all(trees.min(axis=0) <= lower) and np.all(upper <= trees.max(axis=0))
+    _, narrow_lower, narrow_upper = bundle.predict_interval(X, 0.5)
+    assert np.all(lower <= narrow_lower) and np.all(narrow_upper <= upper)
+
+
+def path_contributions(model, X_scaled):
+    """Reference attribution: walk each tree's decision_path in Python."""
+    out = np.zeros(X_scaled.shape)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        values = tree.value[:, 0, 0]
+        paths = estimator.decision_path(X_scaled)
+        for row in range(len(X_scaled)):
+            nodes = paths.indices[paths.indptr[row]:paths.indptr[row + 1]]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                out[row, tree.feature[parent]] += values[child] - values[parent]
+    return out / len(model.estimators_)
+
+
+def test_contributions_add_up_and_match_decision_paths(bundle):
+    X = probe_rows(200, seed=5)
+    bias, contributions = bundle.contributions(X)
+    assert contributions.shape == (len(X), len(FEATURES))
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), bundle.predict(X),
+                               rtol=0, atol=1e-9)
+    reference = path_contributions(bundle.model, bundle.scaler.transform(X))
+    np.testing.assert_allclose(contributions, reference, rtol=0, atol=1e-9)
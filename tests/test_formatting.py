@@ -0,0 +1,58 @@
+"""Vectorized formatting must match Python's format() exactly."""
+import numpy as np
+import pytest
+
+from homevalue.formatting import VECTOR_MIN_ROWS, fixed, location, template, usd
+from homevalue.tiers import TIER_NAMES, tier_codes, tier_names
+
+
+def values(n, seed=0):
+    rng = np.random.default_rng(seed)
+    magnitudes = 10.0 ** rng.uniform(-3, 9, n)
+    signs = rng.choice([-1.0, 1.0], n)
+    return np.concatenate([signs * magnitudes, [0.0, -0.0, 999.5, 1e9 - 0.5]])
+
+
+# Exact binary ties, values one ulp either side of them, and values whose
+# float64 product with 10**decimals rounds onto .5 although they are no tie.
+TIES = np.array([0.5, 1.5, 2.5, -2.5, 0.125, 0.375, 1.0625, 2.675, 1.005, 999_999.5,
+                 np.nextafter(2.5, 3), np.nextafter(2.5, 2),
+                 31.05, 96.35, 58.085, 8.445, 54.3555, 78.7015])
+
+
+@pytest.mark.parametrize("n", [10, VECTOR_MIN_ROWS, 5000])
+@pytest.mark.parametrize("decimals", [0, 1, 2, 3])
+@pytest.mark.parametrize("grouping", [False, True])
+def test_matches_python(n, decimals, grouping):
+    x = values(n, seed=decimals)
+    spec = f"{',' if grouping else ''}.{decimals}f"
+    got = fixed(x, decimals, grouping, prefix="$", suffix="/yr")
+    assert list(got) == [f"${format(v, spec)}/yr" for v in x.tolist()]
+
+
+@pytest.mark.parametrize("decimals", [0, 1, 2, 3])
+def test_ties_round_like_python(decimals):
+    for x in (TIES, np.tile(TIES, VECTOR_MIN_ROWS)):
+        assert list(fixed(x, decimals)) == [format(v, f".{decimals}f") for v in x.tolist()]
+
+
+def test_scalars_and_shapes():
+    assert usd(243975.6) == "$243,976"
+    assert isinstance(usd(1.0), str)
+    assert usd(np.full((2, 3), 1234.0)).shape == (2, 3)
+    assert location(34.05, -118.24) == "34.0°N, 118.2°W"
+    lat = np.full(VECTOR_MIN_ROWS, 34.05)
+    assert template((lat, 1, False), "°N, ", (-118.24, 1, False), "°W")[0] == "34.0°N, -118.2°W"
+
+
+@pytest.mark.parametrize("n", [1, VECTOR_MIN_ROWS])
+def test_rejects_values_it_cannot_format_exactly(n):
+    for bad in (np.nan, np.inf, 1e16):
+        with pytest.raises(ValueError):
+            usd(np.full(n, bad))
+
+
+def test_tiers_at_bounds():
+    prices = np.array([0, 119_999.99, 120_000, 250_000, 449_999, 450_000, 700_000, 5e6])
+    assert tier_codes(prices).tolist() == [0, 0, 1, 2, 2, 3, 4, 4]
+    assert tier_names(prices)[-1] == TIER_NAMES[-1]
@@ -0,0 +1,53 @@
+"""Hot-reload validation of a published artifact."""
+import numpy as np
+import pytest
+
+from homevalue.artifact import ArtifactError, ModelBundle, load_bundle, save_bundle
+from homevalue.reload import ModelWatcher, probe_rows, validate_bundle
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    X = probe_rows(1000, seed=1)
+    y = X[:, 0] * 0.4 - np.abs(X[:, 6] - 37) * 0.3
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=5, random_state=42, n_jobs=1)
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def test_reload_validates_without_the_reference_model(fitted, tmp_path):
+    model, scaler = fitted
+    reference = ModelBundle(model, scaler, {}).predict_reference(probe_rows())
+    save_bundle(model, scaler, {"probe_prices": reference.tolist()}, root=tmp_path)
+    loaded = load_bundle(tmp_path)
+    validate_bundle(loaded)
+    assert loaded._model is None
+
+    loaded.manifest["metadata"]["probe_prices"][0] += 1e-9
+    with pytest.raises(ArtifactError, match="differ from the reference"):
+        validate_bundle(loaded)
+
+
+def test_failed_on_swap_keeps_the_current_model(fitted, tmp_path):
+    model, scaler = fitted
+    first = save_bundle(model, scaler, root=tmp_path)
+    swapped = []
+
+    def on_swap(bundle):
+        if not swapped:
+            swapped.append(None)
+            raise OSError("geo index unreadable")
+        swapped.append(bundle.version)
+
+    watcher = ModelWatcher(load_bundle(tmp_path), root=tmp_path, interval=0, on_swap=on_swap)
+    second = save_bundle(model, scaler, root=tmp_path)
+    assert not watcher.check()
+    assert watcher.bundle.version == first
+    assert watcher.stats()["failures"] == 1 and "geo index" in watcher.last_error
+
+    third = save_bundle(model, scaler, root=tmp_path)
+    assert watcher.check()
+    assert watcher.bundle.version == third == swapped[-1] != second
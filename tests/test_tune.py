@@ -0,0 +1,41 @@
+"""Pareto ranking of search results."""
+from homevalue.tune import SPACES, configs, dominates, pareto_layers, rank
+
+
+def result(name, r2, single_ms, mb):
+    return {"name": name, "r2": r2, "single_ms": single_ms, "mb": mb}
+
+
+def test_dominates():
+    best = result("best", 0.86, 0.5, 1.0)
+    assert dominates(best, result("worse", 0.85, 0.5, 1.0))
+    assert dominates(best, result("slower", 0.86, 0.9, 1.0))
+    assert not dominates(best, best)
+    assert not dominates(best, result("smaller", 0.80, 0.5, 0.1))
+    assert not dominates(result("smaller", 0.80, 0.5, 0.1), best)
+
+
+def test_pareto_layers_and_rank():
+    results = [
+        result("accurate", 0.86, 1.0, 50.0),
+        result("small", 0.84, 1.0, 0.5),
+        result("dominated", 0.83, 2.0, 60.0),
+        result("fast", 0.82, 0.2, 40.0),
+        result("worst", 0.80, 3.0, 70.0),
+    ]
+    layers = [[r["name"] for r in layer] for layer in pareto_layers(results)]
+    assert layers == [["accurate", "small", "fast"], ["dominated"], ["worst"]]
+    assert [r["name"] for r in rank(results)] == ["accurate", "small", "fast",
+                                                  "dominated", "worst"]
+
+
+def test_configs_cover_every_grid_point():
+    grid = list(configs())
+    expected = 0
+    for space in SPACES.values():
+        size = 1
+        for values in space.values():
+            size *= len(values)
+        expected += size
+    assert len(grid) == expected == len({tuple(sorted(c.items(), key=str)) for c in grid})
+    assert {c["engine"] for c in grid} == set(SPACES)